@@ -1,15 +1,14 @@
-import pygame
 import random
 import math
 
-# Initialize pygame
-pygame.init()
+# Pygame and the window are only set up by main(), so importing this file
+# gives the simulation classes without opening anything
+pygame = None
+screen = None
 
 # Set up screen size
 screen_width = 800
 screen_height = 600
-screen = pygame.display.set_mode((screen_width, screen_height))
-pygame.display.set_caption("Ant Simulation")
 
 # Colors
 BLACK = (0, 0, 0)
@@ -25,6 +24,7 @@ ANT_VISION = 50
 
 # Food parameters
 FOOD_SIZE = 10
+FOOD_FIELD_CELL = ANT_VISION  # Pixels per side of a food bucket; at least the sensing range
 
 # Nest position
 NEST_X = screen_width // 2
@@ -47,17 +47,10 @@ class Ant:
 			self.x += ANT_SPEED * math.cos(angle)
 			self.y += ANT_SPEED * math.sin(angle)
 			
-	def find_food(self, foods):
+	def find_food(self, foods, food_field):
 		if not self.carrying_food:
-			closest_food = None
-			closest_distance = ANT_VISION
-
-			# Look for the closest food within vision range
-			for food in foods:
-				dist = math.hypot(food.x - self.x, food.y - self.y)
-				if dist < closest_distance:
-					closest_food = food
-					closest_distance = dist
+			# Look up the closest food within vision range
+			closest_food, closest_distance = food_field.lookup(self.x, self.y)
 
 			# If a food is found within vision range, move toward it
 			if closest_food:
@@ -69,6 +62,7 @@ class Ant:
 				if closest_distance < ANT_SIZE + FOOD_SIZE:
 					self.carrying_food = True
 					foods.remove(closest_food)
+					food_field.remove(closest_food)
 
 	def return_to_nest(self):
 		# Move toward the nest when carrying food
@@ -92,44 +86,95 @@ class Food:
 	def draw(self):
 		pygame.draw.circle(screen, BROWN, (self.x, self.y), FOOD_SIZE)
 
-# Initialize ants and food
-ants = [Ant(random.randint(0, screen_width), random.randint(0, screen_height)) for _ in range(10)]
-foods = [Food(random.randint(100, screen_width-100), random.randint(100, screen_height-100)) for _ in range(5)]
-
-# Main loop
-running = True
-clock = pygame.time.Clock()
-
-while running:
-	screen.fill(WHITE)
-
-	# Handle events
-	for event in pygame.event.get():
-		if event.type == pygame.QUIT:
-			running = False
-
-	# Move ants and perform tasks
-	for ant in ants:
-		if ant.carrying_food:
-			ant.return_to_nest()
-		else:
-			ant.find_food(foods)
-			ant.move()
+class FoodField:
+	"""Foods bucketed by FOOD_FIELD_CELL-sized squares of the map.
+
+	A square is at least as wide as the sensing range, so only the foods in
+	the 3x3 squares around an ant can be in range. Each of those is measured
+	from the ant itself, which gives the same food as scanning all of them.
+	"""
+	def __init__(self, foods=()):
+		self.reset(foods)
+
+	def reset(self, foods):
+		self.buckets = {}
+		for food in foods:
+			self.add(food)
+
+	def bucket(self, x, y):
+		return int(x // FOOD_FIELD_CELL), int(y // FOOD_FIELD_CELL)
+
+	def add(self, food):
+		self.buckets.setdefault(self.bucket(food.x, food.y), []).append(food)
+
+	def remove(self, food):
+		foods = self.buckets.get(self.bucket(food.x, food.y), [])
+		if food in foods:
+			foods.remove(food)
+
+	def lookup(self, x, y):
+		"""Nearest food to (x, y) and its distance, or (None, ANT_VISION) if none is in range."""
+		closest_food, closest_distance = None, ANT_VISION
+		bx, by = self.bucket(x, y)
+		for dx in (-1, 0, 1):
+			for dy in (-1, 0, 1):
+				for food in self.buckets.get((bx + dx, by + dy), ()):
+					distance = math.hypot(food.x - x, food.y - y)
+					if distance < closest_distance:
+						closest_food, closest_distance = food, distance
+		return closest_food, closest_distance
+
+def main():
+	global pygame, screen
+	import pygame
+
+	# Initialize pygame
+	pygame.init()
+	screen = pygame.display.set_mode((screen_width, screen_height))
+	pygame.display.set_caption("Ant Simulation")
+
+	# Initialize ants and food
+	ants = [Ant(random.randint(0, screen_width), random.randint(0, screen_height)) for _ in range(10)]
+	foods = [Food(random.randint(100, screen_width-100), random.randint(100, screen_height-100)) for _ in range(5)]
+	food_field = FoodField(foods)
+
+	# Main loop
+	running = True
+	clock = pygame.time.Clock()
+
+	while running:
+		screen.fill(WHITE)
+
+		# Handle events
+		for event in pygame.event.get():
+			if event.type == pygame.QUIT:
+				running = False
+
+		# Move ants and perform tasks
+		for ant in ants:
+			if ant.carrying_food:
+				ant.return_to_nest()
+			else:
+				ant.find_food(foods, food_field)
+				ant.move()
 		
-		ant.draw()
+			ant.draw()
+
+		# Draw food
+		for food in foods:
+			food.draw()
 
-	# Draw food
-	for food in foods:
-		food.draw()
+		# Draw the nest
+		pygame.draw.circle(screen, GREEN, (NEST_X, NEST_Y), 20)
 
-	# Draw the nest
-	pygame.draw.circle(screen, GREEN, (NEST_X, NEST_Y), 20)
+		# Update the display
+		pygame.display.flip()
 
-	# Update the display
-	pygame.display.flip()
+		# Cap the frame rate
+		clock.tick(30)
 
-	# Cap the frame rate
-	clock.tick(30)
+	# Quit pygame
+	pygame.quit()
 
-# Quit pygame
-pygame.quit()
+if __name__ == "__main__":
+	main()
@@ -1,10 +1,19 @@
-import pygame
 import random
+import mmap
+import os
 import numpy as np
-from pygame.locals import *
 
-# Initialize Pygame
-pygame.init()
+# Pygame is imported on first use so the simulation core loads without it
+pygame = None
+
+def init_pygame():
+    """Import and initialize pygame the first time a window is needed."""
+    global pygame
+    if pygame is None:
+        import pygame as module
+        module.init()
+        pygame = module
+    return pygame
 
 # Constants
 WIDTH = 1200
@@ -13,6 +22,18 @@ CONTROL_HEIGHT = 100
 CELL_SIZE = 5
 GRID_WIDTH = WIDTH // CELL_SIZE
 GRID_HEIGHT = (HEIGHT - CONTROL_HEIGHT) // CELL_SIZE
+TILE_SIZE = 64  # Cells per side of a chunked world tile
+PRUNE_THRESHOLD = 0.01  # Chunked cells below this are dropped after evaporation
+VIEW_WIDTH = WIDTH
+VIEW_HEIGHT = HEIGHT - CONTROL_HEIGHT
+MIN_ZOOM = 1 / 512  # Screen pixels per world cell
+MAX_ZOOM = 40
+PAN_STEP = 50  # Pixels per arrow key press
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept around
+FULL_FLIP_RATIO = 0.6  # Flip the whole display once this share of it is dirty
+MAX_ANT_RECTS = 256  # Beyond this many visible ants, their dirty area is one bounding box
+SENSE_RADIUS = 3  # Cells an ant smells trails from
+SENSE_STEPS = 3  # Samples per sensing ray; longer ranges read coarser pyramid levels
 
 # Colors
 BLACK = (0, 0, 0)
@@ -22,15 +43,36 @@ GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
 GRAY = (128, 128, 128)
 
+_fonts = {}
+_text_surfaces = {}
+
+def get_font(name=None, size=24):
+    """Shared font registry: each (name, size) is loaded once."""
+    font = _fonts.get((name, size))
+    if font is None:
+        font = _fonts[(name, size)] = pygame.font.Font(name, size)
+    return font
+
+def render_text(text, color=WHITE, name=None, size=24):
+    """Antialiased text surface, cached by string and style."""
+    key = (text, color, name, size)
+    surface = _text_surfaces.get(key)
+    if surface is None:
+        if len(_text_surfaces) >= TEXT_CACHE_SIZE:
+            # Evict the oldest entry; dicts keep insertion order
+            del _text_surfaces[next(iter(_text_surfaces))]
+        surface = _text_surfaces[key] = get_font(name, size).render(text, True, color)
+    return surface
+
 class Button:
     def __init__(self, x, y, width, height, text):
         self.rect = pygame.Rect(x, y, width, height)
         self.text = text
-        self.font = pygame.font.Font(None, 24)
+        self.font = get_font(None, 24)
         
     def draw(self, screen, color=WHITE):
         pygame.draw.rect(screen, color, self.rect, 2)
-        text_surface = self.font.render(self.text, True, WHITE)
+        text_surface = render_text(self.text)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
@@ -41,56 +83,808 @@ class Slider:
         self.max_val = max_val
         self.value = initial_val
         self.text = text
-        self.font = pygame.font.Font(None, 24)
+        self.font = get_font(None, 24)
         self.dragging = False
         
     def draw(self, screen):
         pygame.draw.rect(screen, GRAY, self.rect)
         pos = self.rect.x + (self.rect.width * (self.value - self.min_val) / (self.max_val - self.min_val))
         pygame.draw.rect(screen, WHITE, (pos - 5, self.rect.y, 10, self.rect.height))
-        text_surface = self.font.render(f"{self.text}: {self.value:.2f}", True, WHITE)
+        text_surface = render_text(f"{self.text}: {self.value:.2f}")
         screen.blit(text_surface, (self.rect.x, self.rect.y - 20))
     
     def handle_event(self, event):
-        if event.type == MOUSEBUTTONDOWN and event.button == 1:
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.rect.collidepoint(event.pos):
                 self.dragging = True
-        elif event.type == MOUSEBUTTONUP and event.button == 1:
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
             self.dragging = False
-        elif event.type == MOUSEMOTION and self.dragging:
+        elif event.type == pygame.MOUSEMOTION and self.dragging:
             rel_x = min(max(event.pos[0], self.rect.x), self.rect.right)
             self.value = self.min_val + (rel_x - self.rect.x) * (self.max_val - self.min_val) / self.rect.width
 
+def scatter_deposit(grid, xs, ys, amounts, mode='add', cap=None):
+    """Apply a batch of pheromone deposits to grid[xs, ys] in one scatter.
+
+    Deposits landing on the same cell are combined first: 'add' sums them,
+    'max' keeps the largest. The combined value then meets the current cell
+    value the same way and is clipped to cap, which matches applying each
+    deposit in turn with min(cap, value + amount) or max(value, amount).
+    """
+    if isinstance(grid, ChunkedGrid):
+        grid.scatter(xs, ys, amounts, mode, cap)
+        return
+    xs = np.asarray(xs, dtype=np.intp)
+    if len(xs) == 0:
+        return
+    flat = np.ravel_multi_index((xs, np.asarray(ys, dtype=np.intp)), grid.shape)
+    cells, slot = np.unique(flat, return_inverse=True)
+    amounts = np.broadcast_to(np.asarray(amounts, dtype=float), flat.shape)
+    if mode == 'add':
+        combined = np.bincount(slot, weights=amounts, minlength=len(cells))
+    elif mode == 'max':
+        combined = np.full(len(cells), -np.inf)
+        np.maximum.at(combined, slot, amounts)
+    else:
+        raise ValueError(f"unknown deposit mode {mode!r}")
+    index = np.unravel_index(cells, grid.shape)
+    current = grid[index]
+    updated = current + combined if mode == 'add' else np.maximum(current, combined)
+    if cap is not None:
+        updated = np.minimum(updated, cap)
+    grid[index] = updated
+
+class ChunkedGrid:
+    """Sparse (width, height) grid stored as TILE_SIZE x TILE_SIZE tiles.
+
+    Tiles are allocated on the first non-zero write and freed again once
+    every cell in them is zero, so only the explored part of the world uses
+    memory. Indexing mirrors the dense numpy grids: grid[x, y] reads or
+    writes one cell, grid[x0:x1, y0:y1] reads or fills a window that may
+    span any number of tiles.
+    """
+    def __init__(self, width, height, tile_size=TILE_SIZE, dtype=np.float64,
+                 prune_threshold=PRUNE_THRESHOLD):
+        self.shape = (width, height)
+        self.tile_size = tile_size
+        self.dtype = np.dtype(dtype)
+        self.prune_threshold = prune_threshold
+        self.tiles = {}
+
+    def _check(self, x, y):
+        if not (0 <= x < self.shape[0] and 0 <= y < self.shape[1]):
+            raise IndexError(f"cell ({x}, {y}) outside grid of shape {self.shape}")
+
+    def _bounds(self, key, axis):
+        # Clip a slice to the grid the same way numpy does for in-range slices
+        start, stop, step = key.indices(self.shape[axis])
+        if step != 1:
+            raise IndexError("ChunkedGrid only supports contiguous slices")
+        return start, max(start, stop)
+
+    def _window_tiles(self, x0, x1, y0, y1):
+        # Yield every tile key overlapping the window plus the overlap in both frames
+        ts = self.tile_size
+        for tx in range(x0 // ts, (x1 - 1) // ts + 1):
+            for ty in range(y0 // ts, (y1 - 1) // ts + 1):
+                cx0, cx1 = max(x0, tx * ts), min(x1, (tx + 1) * ts)
+                cy0, cy1 = max(y0, ty * ts), min(y1, (ty + 1) * ts)
+                local = (slice(cx0 - tx * ts, cx1 - tx * ts), slice(cy0 - ty * ts, cy1 - ty * ts))
+                window = (slice(cx0 - x0, cx1 - x0), slice(cy0 - y0, cy1 - y0))
+                yield (tx, ty), local, window
+
+    def __getitem__(self, key):
+        x, y = key
+        if isinstance(x, slice) or isinstance(y, slice):
+            x0, x1 = self._bounds(x if isinstance(x, slice) else slice(x, x + 1), 0)
+            y0, y1 = self._bounds(y if isinstance(y, slice) else slice(y, y + 1), 1)
+            out = np.zeros((x1 - x0, y1 - y0), dtype=self.dtype)
+            if x1 > x0 and y1 > y0:
+                for tile_key, local, window in self._window_tiles(x0, x1, y0, y1):
+                    tile = self.tiles.get(tile_key)
+                    if tile is not None:
+                        out[window] = tile[local]
+            if not isinstance(x, slice):
+                out = out[0]
+            elif not isinstance(y, slice):
+                out = out[:, 0]
+            return out
+        self._check(x, y)
+        ts = self.tile_size
+        tile = self.tiles.get((x // ts, y // ts))
+        if tile is None:
+            return self.dtype.type(0)
+        return tile[x % ts, y % ts]
+
+    def __setitem__(self, key, value):
+        x, y = key
+        if isinstance(x, slice) or isinstance(y, slice):
+            x0, x1 = self._bounds(x if isinstance(x, slice) else slice(x, x + 1), 0)
+            y0, y1 = self._bounds(y if isinstance(y, slice) else slice(y, y + 1), 1)
+            if x1 > x0 and y1 > y0:
+                for tile_key, local, _ in self._window_tiles(x0, x1, y0, y1):
+                    self._write(tile_key, local, value)
+            return
+        self._check(x, y)
+        ts = self.tile_size
+        self._write((x // ts, y // ts), (x % ts, y % ts), value)
+
+    def _write(self, tile_key, local, value):
+        tile = self.tiles.get(tile_key)
+        if tile is None:
+            if value == 0:
+                return
+            tile = self.tiles[tile_key] = np.zeros((self.tile_size, self.tile_size), dtype=self.dtype)
+        tile[local] = value
+        if value == 0 and not tile.any():
+            del self.tiles[tile_key]
+
+    def __imul__(self, factor):
+        # Evaporation: scale every live tile and free the ones that faded out
+        for tile_key in list(self.tiles):
+            tile = self.tiles[tile_key]
+            tile *= factor
+            tile[tile < self.prune_threshold] = 0
+            if not tile.any():
+                del self.tiles[tile_key]
+        return self
+
+    def scatter(self, xs, ys, amounts, mode='add', cap=None):
+        """scatter_deposit for chunked grids: one scatter per touched tile."""
+        xs = np.asarray(xs, dtype=np.intp)
+        ys = np.asarray(ys, dtype=np.intp)
+        if len(xs) == 0:
+            return
+        if xs.min() < 0 or ys.min() < 0 or xs.max() >= self.shape[0] or ys.max() >= self.shape[1]:
+            raise IndexError(f"deposit outside grid of shape {self.shape}")
+        amounts = np.broadcast_to(np.asarray(amounts, dtype=float), xs.shape)
+        ts = self.tile_size
+        keys = np.stack((xs // ts, ys // ts), axis=1)
+        tile_keys, group = np.unique(keys, axis=0, return_inverse=True)
+        group = group.ravel()
+        for i, (tx, ty) in enumerate(tile_keys):
+            members = group == i
+            tile_key = (int(tx), int(ty))
+            tile = self.tiles.get(tile_key)
+            if tile is None:
+                tile = self.tiles[tile_key] = np.zeros((ts, ts), dtype=self.dtype)
+            scatter_deposit(tile, xs[members] % ts, ys[members] % ts, amounts[members], mode, cap)
+
+    def gather(self, xs, ys):
+        """Values at cells (xs[i], ys[i]), read with one fancy index per touched tile."""
+        xs = np.asarray(xs, dtype=np.intp)
+        ys = np.asarray(ys, dtype=np.intp)
+        out = np.zeros(xs.shape, dtype=self.dtype)
+        if len(xs) == 0:
+            return out
+        ts = self.tile_size
+        keys = np.stack((xs // ts, ys // ts), axis=1)
+        tile_keys, group = np.unique(keys, axis=0, return_inverse=True)
+        group = group.ravel()
+        for i, (tx, ty) in enumerate(tile_keys):
+            tile = self.tiles.get((int(tx), int(ty)))
+            if tile is not None:
+                members = group == i
+                out[members] = tile[xs[members] % ts, ys[members] % ts]
+        return out
+
+    def pooled(self):
+        """2x max-pooled copy as a ChunkedGrid of half the size, built tile by tile.
+
+        Each tile pools into one quarter of a tile of the result, so the cost
+        and memory follow the allocated tiles rather than the world size.
+        """
+        ts = self.tile_size
+        half = ts // 2
+        width, height = self.shape
+        pooled = ChunkedGrid((width + 1) // 2, (height + 1) // 2, ts, self.dtype, self.prune_threshold)
+        for (tx, ty), tile in self.tiles.items():
+            target = pooled.tiles.get((tx // 2, ty // 2))
+            if target is None:
+                target = pooled.tiles[tx // 2, ty // 2] = np.zeros((ts, ts), dtype=self.dtype)
+            ox, oy = tx % 2 * half, ty % 2 * half
+            target[ox:ox + half, oy:oy + half] = block_max(tile, 2)
+        return pooled
+
+    def items(self):
+        """Yield (x0, y0, tile) for every allocated tile, in world cell coordinates."""
+        ts = self.tile_size
+        for (tx, ty), tile in self.tiles.items():
+            yield tx * ts, ty * ts, tile
+
+    def clear(self):
+        self.tiles.clear()
+
+    def fill(self, value):
+        if value != 0:
+            raise ValueError("ChunkedGrid can only be filled with zero")
+        self.clear()
+
+    @property
+    def nbytes(self):
+        return sum(tile.nbytes for tile in self.tiles.values())
+
+def prefetch_tiles(grid, tiles, tile_size=TILE_SIZE):
+    """Hint the OS to page in (x_tile, y_tile) blocks of a memory-mapped grid."""
+    mm = getattr(grid, '_mmap', None)
+    if mm is None or not hasattr(mm, 'madvise'):
+        return
+    start = grid.offset % mmap.ALLOCATIONGRANULARITY
+    row_bytes, item = grid.strides[0], grid.itemsize
+    for tx, ty in tiles:
+        y0 = ty * tile_size
+        y1 = min(grid.shape[1], y0 + tile_size)
+        for x in range(tx * tile_size, min(grid.shape[0], (tx + 1) * tile_size)):
+            begin = start + x * row_bytes + y0 * item
+            aligned = begin - begin % mmap.PAGESIZE
+            try:
+                mm.madvise(mmap.MADV_WILLNEED, aligned, begin - aligned + (y1 - y0) * item)
+            except (OSError, ValueError):
+                return
+
+NORMAL_CODES = 16  # Wall normals are quantized to this many directions
+NO_NORMAL = 255  # Wall cells with no free neighbor
+NORMAL_VECTORS = np.stack([np.cos(np.arange(NORMAL_CODES) * 2 * np.pi / NORMAL_CODES),
+                           np.sin(np.arange(NORMAL_CODES) * 2 * np.pi / NORMAL_CODES)], axis=1)
+
+class ObstacleMap:
+    """Walls over a (width, height) world, stored as a packed bitmask.
+
+    One bit per cell says whether it is blocked. Each wall cell also has a
+    uint8 code for its outward normal, quantized to NORMAL_CODES
+    directions. The codes are rebuilt lazily after the walls change, so
+    collisions become two table lookups.
+    """
+    def __init__(self, width, height):
+        self.shape = (width, height)
+        self.bits = np.zeros((width, (height + 7) // 8), dtype=np.uint8)
+        self.version = 0
+        # (version, x0, x1, y0, y1, value) per edit, so flow fields can update incrementally
+        self.changes = []
+        self._normals = None
+        self._normals_version = -1
+
+    def _paint(self, x0, x1, y0, y1, value, where=None):
+        # Set cells in [x0, x1) x [y0, y1) to value, only where the mask is true
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.shape[0], x1), min(self.shape[1], y1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        b0, b1 = y0 // 8, (y1 + 7) // 8
+        cells = np.unpackbits(self.bits[x0:x1, b0:b1], axis=1)
+        region = cells[:, y0 - b0 * 8:y1 - b0 * 8]
+        region[where[:x1 - x0, :y1 - y0] if where is not None else slice(None)] = value
+        self.bits[x0:x1, b0:b1] = np.packbits(cells, axis=1)
+        self.version += 1
+        self.changes.append((self.version, x0, x1, y0, y1, value))
+
+    def add_rect(self, x0, y0, x1, y1):
+        self._paint(x0, x1, y0, y1, 1)
+
+    def clear_rect(self, x0, y0, x1, y1):
+        self._paint(x0, x1, y0, y1, 0)
+
+    def _disc(self, cx, cy, radius):
+        xs = np.arange(cx - radius, cx + radius + 1)
+        ys = np.arange(cy - radius, cy + radius + 1)
+        inside = (xs[:, None] - cx) ** 2 + (ys[None, :] - cy) ** 2 <= radius ** 2
+        x0, y0 = cx - radius, cy - radius
+        # Trim the part of the disc hanging off the low edges
+        return x0, y0, inside[max(0, -x0):, max(0, -y0):]
+
+    def add_circle(self, cx, cy, radius):
+        x0, y0, inside = self._disc(cx, cy, radius)
+        self._paint(x0, cx + radius + 1, y0, cy + radius + 1, 1, inside)
+
+    def clear_circle(self, cx, cy, radius):
+        x0, y0, inside = self._disc(cx, cy, radius)
+        self._paint(x0, cx + radius + 1, y0, cy + radius + 1, 0, inside)
+
+    @classmethod
+    def maze(cls, width, height, corridor=8, seed=None):
+        """Perfect maze of corridor-wide passages separated by one-cell walls."""
+        rng = random.Random(seed)
+        obstacles = cls(width, height)
+        cols, rows = width // corridor, height // corridor
+        walls = np.ones((width, height), dtype=np.uint8)
+        visited = np.zeros((cols, rows), dtype=bool)
+        stack = [(rng.randrange(cols), rng.randrange(rows))]
+        visited[stack[0]] = True
+        while stack:
+            i, j = stack[-1]
+            walls[i*corridor:(i+1)*corridor - 1, j*corridor:(j+1)*corridor - 1] = 0
+            options = [(i + di, j + dj) for di, dj in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                       if 0 <= i + di < cols and 0 <= j + dj < rows and not visited[i + di, j + dj]]
+            if not options:
+                stack.pop()
+                continue
+            ni, nj = rng.choice(options)
+            # Knock out the wall between the two maze cells
+            x0, y0 = min(i, ni) * corridor, min(j, nj) * corridor
+            x1 = (max(i, ni) + 1) * corridor - 1
+            y1 = (max(j, nj) + 1) * corridor - 1
+            walls[x0:x1, y0:y1] = 0
+            visited[ni, nj] = True
+            stack.append((ni, nj))
+        obstacles.bits = np.packbits(walls, axis=1)
+        obstacles.version += 1
+        obstacles.changes.append((obstacles.version, 0, width, 0, height, 1))
+        return obstacles
+
+    def window(self, x0, x1, y0, y1):
+        """Unpacked boolean wall mask of [x0, x1) x [y0, y1), clipped to the world."""
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.shape[0], x1), min(self.shape[1], y1)
+        if x0 >= x1 or y0 >= y1:
+            return np.zeros((max(0, x1 - x0), max(0, y1 - y0)), dtype=bool)
+        b0 = y0 // 8
+        cells = np.unpackbits(self.bits[x0:x1, b0:(y1 + 7) // 8], axis=1)
+        return cells[:, y0 - b0 * 8:y1 - b0 * 8].astype(bool)
+
+    def blocked(self, xs, ys):
+        """Vectorized wall test for cells (xs, ys); positions are floored to cells."""
+        xs = np.clip(np.asarray(xs, dtype=float).astype(np.intp), 0, self.shape[0] - 1)
+        ys = np.clip(np.asarray(ys, dtype=float).astype(np.intp), 0, self.shape[1] - 1)
+        return ((self.bits[xs, ys >> 3] >> (7 - (ys & 7))) & 1).astype(bool)
+
+    @property
+    def normals(self):
+        """(width, height) uint8 table of wall normal codes, NO_NORMAL off walls."""
+        if self._normals_version != self.version:
+            walls = self.window(0, self.shape[0], 0, self.shape[1])
+            # Outside the world counts as wall so border normals point inward
+            free = np.pad(~walls, 1)
+            nx = np.zeros(walls.shape)
+            ny = np.zeros(walls.shape)
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    neighbor = free[1 + dx:1 + dx + walls.shape[0], 1 + dy:1 + dy + walls.shape[1]]
+                    nx += dx * neighbor
+                    ny += dy * neighbor
+            codes = np.round(np.arctan2(ny, nx) / (2 * np.pi) * NORMAL_CODES).astype(int) % NORMAL_CODES
+            codes[~walls | ((nx == 0) & (ny == 0))] = NO_NORMAL
+            self._normals = codes.astype(np.uint8)
+            self._normals_version = self.version
+        return self._normals
+
+    def resolve(self, xs, ys, new_xs, new_ys, directions):
+        """Vectorized collision step for ants moving from (xs, ys) to (new_xs, new_ys).
+
+        Each move is sampled at sub-cell steps so fast ants cannot tunnel
+        through thin walls. An ant whose path enters a wall stays where it
+        was, and its heading is mirrored about that wall cell's normal.
+        Ants that start inside a wall move freely so they can escape it.
+        """
+        new_xs, new_ys, directions = new_xs.copy(), new_ys.copy(), directions.copy()
+        steps = max(1, int(np.ceil(np.max(np.hypot(new_xs - xs, new_ys - ys), initial=0))))
+        hit = self.blocked(xs, ys)  # Already stuck: treat as resolved
+        stuck = hit.copy()
+        hit_x = np.zeros(len(xs), dtype=np.intp)
+        hit_y = np.zeros(len(xs), dtype=np.intp)
+        for k in range(1, steps + 1):
+            t = k / steps
+            px = xs + t * (new_xs - xs)
+            py = ys + t * (new_ys - ys)
+            entered = self.blocked(px, py) & ~hit
+            hit_x[entered] = px[entered].astype(np.intp)
+            hit_y[entered] = py[entered].astype(np.intp)
+            hit |= entered
+        hit &= ~stuck
+        if not hit.any():
+            return new_xs, new_ys, directions
+        codes = self.normals[hit_x[hit], hit_y[hit]]
+        heading = np.stack([np.cos(directions[hit]), np.sin(directions[hit])], axis=1)
+        normal = np.where((codes == NO_NORMAL)[:, None], -heading,
+                          NORMAL_VECTORS[np.minimum(codes, NORMAL_CODES - 1)])
+        along = np.sum(heading * normal, axis=1, keepdims=True)
+        reflected = heading - 2 * np.minimum(along, 0) * normal
+        directions[hit] = np.arctan2(reflected[:, 1], reflected[:, 0])
+        new_xs[hit] = xs[hit]
+        new_ys[hit] = ys[hit]
+        return new_xs, new_ys, directions
+
+FLOW_OFFSETS = [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]
+FLOW_COSTS = [float(np.hypot(dx, dy)) for dx, dy in FLOW_OFFSETS]
+FLOW_ANGLES = np.array([np.arctan2(dy, dx) for dx, dy in FLOW_OFFSETS])
+NO_FLOW = 255  # Target, wall or unreachable cell
+
+class FlowField:
+    """Path distance to a target cell and the first step of the path from every cell.
+
+    Distances come from an 8-connected shortest-path search over the free
+    cells of an ObstacleMap, so paths go around walls; diagonal steps may
+    not cut wall corners. sync() follows the map's edit log: opened cells
+    are relaxed from their surroundings, while new walls trigger a full
+    recompute.
+    """
+    def __init__(self, target, obstacles):
+        self.target = target
+        self.obstacles = obstacles
+        self.version = None
+        self.sync()
+
+    def sync(self):
+        obstacles = self.obstacles
+        if self.version == obstacles.version:
+            return
+        width, height = obstacles.shape
+        self.walls = obstacles.window(0, width, 0, height)
+        changes = None
+        if self.version is not None:
+            changes = [change for change in obstacles.changes if change[0] > self.version]
+        self.moves = self._moves()
+        if changes is None or any(change[5] for change in changes):
+            self.distance = np.full((width, height), np.inf)
+            self.distance[self.target] = 0.0
+            self._relax(np.array([self.target[0] * height + self.target[1]]))
+        else:
+            # Opening cells only shortens paths: restart the search from the
+            # reachable cells around each opened area
+            seeds = []
+            for _, x0, x1, y0, y1, _ in changes:
+                x0, y0 = max(0, x0 - 1), max(0, y0 - 1)
+                xs, ys = np.nonzero(np.isfinite(self.distance[x0:x1 + 1, y0:y1 + 1]))
+                seeds.append((xs + x0) * height + ys + y0)
+            self._relax(np.concatenate(seeds))
+        self.direction = self._directions()
+        self.version = obstacles.version
+
+    def _moves(self):
+        # (cells, 8) table of the steps allowed out of each flat cell index
+        width, height = self.walls.shape
+        free = np.pad(~self.walls, 1)
+        moves = np.empty((width, height, len(FLOW_OFFSETS)), dtype=bool)
+        for code, (dx, dy) in enumerate(FLOW_OFFSETS):
+            moves[:, :, code] = free[1 + dx:1 + dx + width, 1 + dy:1 + dy + height]
+            if dx and dy:
+                moves[:, :, code] &= (free[1 + dx:1 + dx + width, 1:1 + height] &
+                                      free[1:1 + width, 1 + dy:1 + dy + height])
+        return moves.reshape(width * height, len(FLOW_OFFSETS))
+
+    def _relax(self, cells):
+        """Lower distances outward from flat cell indices until none improves.
+
+        Each round pushes every cell whose distance just dropped to all its
+        neighbors at once, so the work follows the cells that change rather
+        than the whole world.
+        """
+        height = self.walls.shape[1]
+        offsets = np.array([dx * height + dy for dx, dy in FLOW_OFFSETS])
+        costs = np.array(FLOW_COSTS)
+        flat = self.distance.reshape(-1)  # A view, so updates land in distance
+        while len(cells):
+            allowed = self.moves[cells]
+            targets = (cells[:, None] + offsets)[allowed]
+            values = (flat[cells][:, None] + costs)[allowed]
+            better = values < flat[targets]
+            targets = targets[better]
+            np.minimum.at(flat, targets, values[better])
+            cells = np.unique(targets)
+
+    def _directions(self):
+        # Each cell points at the neighbor that lies on its shortest path
+        width, height = self.walls.shape
+        distance = np.pad(self.distance, 1, constant_values=np.inf)
+        walls = np.pad(self.walls, 1, constant_values=True)
+        best = np.full((width, height), np.inf)
+        direction = np.full((width, height), NO_FLOW, dtype=np.uint8)
+        for code, ((dx, dy), cost) in enumerate(zip(FLOW_OFFSETS, FLOW_COSTS)):
+            candidate = distance[1 + dx:1 + dx + width, 1 + dy:1 + dy + height] + cost
+            if dx and dy:
+                corner = (walls[1 + dx:1 + dx + width, 1:1 + height] |
+                          walls[1:1 + width, 1 + dy:1 + dy + height])
+                candidate[corner] = np.inf
+            better = candidate < best
+            best[better] = candidate[better]
+            direction[better] = code
+        direction[self.walls | np.isinf(self.distance)] = NO_FLOW
+        direction[self.target] = NO_FLOW
+        return direction
+
+def grid_tiles(grid):
+    """Yield (x0, y0, block) for a dense or chunked grid."""
+    if isinstance(grid, ChunkedGrid):
+        yield from grid.items()
+    else:
+        yield 0, 0, grid
+
+def block_max(block, step):
+    """Downsample a 2D block by taking the max of each step x step cell group."""
+    if step == 1:
+        return block
+    w, h = block.shape
+    pw, ph = -w % step, -h % step
+    if pw or ph:
+        block = np.pad(block, ((0, pw), (0, ph)))
+    return block.reshape((w + pw) // step, step, (h + ph) // step, step).max(axis=(1, 3))
+
+def view_image(grid, x0, y0, x1, y1, step):
+    """Aggregated view of grid[x0:x1, y0:y1] with one value per step x step cells.
+
+    x0 and y0 must be multiples of step. Dense grids are sliced directly;
+    chunked grids only touch their allocated tiles, and a tile smaller than
+    one output pixel collapses to its max, so cost follows the view size.
+    """
+    out = np.zeros(((x1 - x0 + step - 1) // step, (y1 - y0 + step - 1) // step))
+    if not isinstance(grid, ChunkedGrid):
+        image = block_max(np.asarray(grid[x0:x1, y0:y1]), step)
+        out[:image.shape[0], :image.shape[1]] = image
+        return out
+    ts = grid.tile_size
+    for tx0, ty0, tile in grid.items():
+        cx0, cx1 = max(x0, tx0), min(x1, tx0 + ts)
+        cy0, cy1 = max(y0, ty0), min(y1, ty0 + ts)
+        if cx0 >= cx1 or cy0 >= cy1:
+            continue
+        region = tile[cx0 - tx0:cx1 - tx0, cy0 - ty0:cy1 - ty0]
+        bx, by = (cx0 - x0) // step, (cy0 - y0) // step
+        if step >= ts:
+            out[bx, by] = max(out[bx, by], region.max())
+        else:
+            image = block_max(region, step)
+            target = out[bx:bx + image.shape[0], by:by + image.shape[1]]
+            np.maximum(target, image, out=target)
+    return out
+
+class PheromonePyramid:
+    """Max-pooled 2x downsamples of a pheromone grid for long-range sensing.
+
+    Level k holds the strongest value of each 2**k x 2**k block, so a ray of
+    any length can be sampled in SENSE_STEPS reads on the level whose cells
+    are about radius / SENSE_STEPS wide. Levels are built on demand, up to
+    the coarsest one asked for, and dropped by invalidate() once the grid
+    changes. The levels of a chunked grid are chunked grids too, so they only
+    hold the explored part of the world.
+    """
+    def __init__(self, grid):
+        self.grid = grid
+        self.levels = [grid]
+
+    def invalidate(self):
+        del self.levels[1:]
+
+    def level(self, k):
+        while len(self.levels) <= k:
+            if isinstance(self.grid, ChunkedGrid):
+                self.levels.append(self.levels[-1].pooled())
+            elif len(self.levels) == 1:
+                width, height = self.grid.shape
+                self.levels.append(view_image(self.grid, 0, 0, width, height, 2))
+            else:
+                self.levels.append(block_max(self.levels[-1], 2))
+        return self.levels[k]
+
+    def sample(self, k, xs, ys):
+        """Level k values over the world cells (xs, ys)."""
+        level = self.level(k)
+        if isinstance(level, ChunkedGrid):
+            return level.gather(xs >> k, ys >> k)
+        return level[xs >> k, ys >> k]
+
+def draw_points(surface, xs, ys, states, palette, size=1):
+    """Batch-draw size x size squares at integer pixel positions.
+
+    Pixels are written straight into the surface pixel array with one fancy
+    index, colored by palette[state]; later points win where they overlap.
+    """
+    if len(xs) == 0:
+        return
+    dx, dy = np.meshgrid(np.arange(size), np.arange(size), indexing='ij')
+    px = (np.floor(xs).astype(int)[:, None] + dx.ravel()).ravel()
+    py = (np.floor(ys).astype(int)[:, None] + dy.ravel()).ravel()
+    mapped = np.array([surface.map_rgb(color) for color in palette])
+    values = np.repeat(mapped[states], size * size)
+    w, h = surface.get_size()
+    inside = (px >= 0) & (px < w) & (py >= 0) & (py < h)
+    pixels = pygame.surfarray.pixels2d(surface)
+    pixels[px[inside], py[inside]] = values[inside]
+    del pixels  # Unlock the surface
+
+class Camera:
+    """Pan/zoom view of the world; zoom is screen pixels per world cell."""
+    def __init__(self, world_width, world_height, center, zoom=CELL_SIZE,
+                 view_width=VIEW_WIDTH, view_height=VIEW_HEIGHT):
+        self.world_width = world_width
+        self.world_height = world_height
+        self.view_width = view_width
+        self.view_height = view_height
+        self.zoom = zoom
+        self.x = center[0] - view_width / zoom / 2
+        self.y = center[1] - view_height / zoom / 2
+        self.panning = False
+
+    def world_to_screen(self, x, y):
+        return (x - self.x) * self.zoom, (y - self.y) * self.zoom
+
+    def screen_to_world(self, px, py):
+        return self.x + px / self.zoom, self.y + py / self.zoom
+
+    def pan(self, dx, dy):
+        """Move the view by (dx, dy) screen pixels, keeping some of the world in sight."""
+        self.x = min(max(self.x + dx / self.zoom, -self.view_width / self.zoom / 2),
+                     self.world_width - self.view_width / self.zoom / 2)
+        self.y = min(max(self.y + dy / self.zoom, -self.view_height / self.zoom / 2),
+                     self.world_height - self.view_height / self.zoom / 2)
+
+    def zoom_at(self, factor, px, py):
+        """Zoom by factor keeping the world point under screen pixel (px, py) fixed."""
+        wx, wy = self.screen_to_world(px, py)
+        self.zoom = min(MAX_ZOOM, max(MIN_ZOOM, self.zoom * factor))
+        self.x = wx - px / self.zoom
+        self.y = wy - py / self.zoom
+
+    @property
+    def step(self):
+        """World cells per rendered pixel block: 1 when zoomed in, a power of two when zoomed out."""
+        if self.zoom >= 1:
+            return 1
+        return 1 << int(np.ceil(np.log2(1 / self.zoom)))
+
+    def visible_cells(self):
+        """Visible world window (x0, y0, x1, y1), with x0/y0 aligned to step."""
+        step = self.step
+        x0 = max(0, int(self.x // step) * step)
+        y0 = max(0, int(self.y // step) * step)
+        x1 = min(self.world_width, int(np.ceil(self.x + self.view_width / self.zoom)))
+        y1 = min(self.world_height, int(np.ceil(self.y + self.view_height / self.zoom)))
+        return x0, y0, max(x0, x1), max(y0, y1)
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEWHEEL:
+            px, py = pygame.mouse.get_pos()
+            if py < self.view_height:
+                self.zoom_at(1.25 ** event.y, px, py)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
+            self.panning = event.pos[1] < self.view_height
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 3:
+            self.panning = False
+        elif event.type == pygame.MOUSEMOTION and self.panning:
+            self.pan(-event.rel[0], -event.rel[1])
+        elif event.type == pygame.KEYDOWN:
+            moves = {pygame.K_LEFT: (-PAN_STEP, 0), pygame.K_RIGHT: (PAN_STEP, 0),
+                     pygame.K_UP: (0, -PAN_STEP), pygame.K_DOWN: (0, PAN_STEP)}
+            if event.key in moves:
+                self.pan(*moves[event.key])
+
+class Compositor:
+    """Cached screen layers plus dirty-rectangle display updates.
+
+    A layer is a screen-sized canvas redrawn by its callback only after
+    invalidate(); blit_layer() copies its area to the screen every frame.
+    Anything that changes on screen must be reported with mark_dirty() so
+    present() can push just those rectangles, or flip once most of the
+    display changed anyway.
+    """
+    def __init__(self, screen, full_flip_ratio=FULL_FLIP_RATIO):
+        self.screen = screen
+        self.full_flip_ratio = full_flip_ratio
+        self.layers = {}
+        self.dirty = []
+
+    def add_layer(self, name, rect, draw, colorkey=None):
+        canvas = pygame.Surface(self.screen.get_size())
+        if colorkey is not None:
+            canvas.set_colorkey(colorkey)
+        self.layers[name] = {'rect': pygame.Rect(rect), 'canvas': canvas, 'draw': draw, 'valid': False}
+
+    def invalidate(self, name, rects=None):
+        """Schedule a redraw of a layer; rects limits what is pushed to the display."""
+        layer = self.layers[name]
+        layer['valid'] = False
+        for rect in rects if rects is not None else [layer['rect']]:
+            self.mark_dirty(rect)
+
+    def blit_layer(self, name):
+        layer = self.layers[name]
+        if not layer['valid']:
+            layer['canvas'].fill(layer['canvas'].get_colorkey() or BLACK)
+            layer['draw'](layer['canvas'])
+            layer['valid'] = True
+        self.screen.blit(layer['canvas'], layer['rect'], layer['rect'])
+
+    def mark_dirty(self, rect):
+        rect = pygame.Rect(rect).clip(self.screen.get_rect())
+        if rect.width and rect.height:
+            self.dirty.append(rect)
+
+    def present(self):
+        if not self.dirty:
+            return
+        width, height = self.screen.get_size()
+        if sum(r.width * r.height for r in self.dirty) >= self.full_flip_ratio * width * height:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty)
+        self.dirty = []
+
 class AntColony:
-    def __init__(self, num_ants=30):
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption("Ant Colony Simulation")
-        
-        # Controls
+    def __init__(self, num_ants=30, world_size=None, chunked=False, storage_dir=None,
+                 obstacles=None, pheromone_dtype=np.float64, sense_radius=SENSE_RADIUS,
+                 speed=1.0, trail_follow=0.8):
+        # Cells an ant moves per tick and the chance it follows a food trail;
+        # the sliders write here once a view is open
+        self.speed = speed
+        self.trail_follow = trail_follow
         self.paused = False
-        self.play_pause_btn = Button(10, HEIGHT - 90, 100, 30, "Play/Pause")
-        self.reset_btn = Button(120, HEIGHT - 90, 100, 30, "Reset")
-        self.randomize_btn = Button(230, HEIGHT - 90, 100, 30, "Randomize")
+        # The window and controls only exist after open_view(), so a colony
+        # can be stepped without a display
+        self.screen = None
         
-        self.speed_slider = Slider(10, HEIGHT - 40, 200, 20, 0.1, 3.0, 1.0, "Speed")
-        self.pheromone_weight_slider = Slider(220, HEIGHT - 40, 200, 20, 0.0, 1.0, 0.8, "Trail Follow")
+        # World size in cells; chunked worlds only allocate the tiles ants touch
+        self.world_width, self.world_height = world_size or (GRID_WIDTH, GRID_HEIGHT)
+        self.chunked = chunked
+        # Dense grids can live in np.memmap files under storage_dir instead of RAM
+        self.storage_dir = storage_dir
+        # Optional ObstacleMap of walls ants have to steer around
+        self.obstacles = obstacles
+        # Trails are capped at 5, so float32 (or float16, about 0.003 off at
+        # the cap) halves or quarters the bytes per cell with little change
+        self.pheromone_dtype = pheromone_dtype
+        # Ants smelling further than SENSE_STEPS cells sample a pheromone pyramid
+        self.sense_radius = sense_radius
         
         # Initialize base variables
-        self.nest = (GRID_WIDTH//2, GRID_HEIGHT//2)
+        self.nest = (self.world_width//2, self.world_height//2)
+        # Returning ants follow the nest's flow field around walls
+        self.flow_field = FlowField(self.nest, obstacles) if obstacles is not None else None
         # Separate pheromone grids for food and nest trails
-        self.food_pheromone = np.zeros((GRID_WIDTH, GRID_HEIGHT))
-        self.home_pheromone = np.zeros((GRID_WIDTH, GRID_HEIGHT))
-        self.food = np.zeros((GRID_WIDTH, GRID_HEIGHT))
+        self.food_pheromone = self.new_grid('food_pheromone', self.pheromone_dtype)
+        self.food_pyramid = PheromonePyramid(self.food_pheromone)
+        self.home_pheromone = self.new_grid('home_pheromone', self.pheromone_dtype)
+        self.food = self.new_grid('food')
         self.food_sources = []
         
+        # View onto the world; the default world fits the screen exactly
+        self.camera = Camera(self.world_width, self.world_height, self.nest)
+        
         # Initialize ants and food
         self.init_simulation(num_ants)
     
+    def open_view(self):
+        """Open the window and create the controls and cached screen layers."""
+        init_pygame()
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Ant Colony Simulation")
+        
+        # Controls
+        self.play_pause_btn = Button(10, HEIGHT - 90, 100, 30, "Play/Pause")
+        self.reset_btn = Button(120, HEIGHT - 90, 100, 30, "Reset")
+        self.randomize_btn = Button(230, HEIGHT - 90, 100, 30, "Randomize")
+        
+        self.speed_slider = Slider(10, HEIGHT - 40, 200, 20, 0.1, 3.0, self.speed, "Speed")
+        self.pheromone_weight_slider = Slider(220, HEIGHT - 40, 200, 20, 0.0, 1.0, self.trail_follow,
+                                              "Trail Follow")
+        self.controls_state = None
+        
+        # Static content is cached in layers; only changed regions reach the display
+        self.compositor = Compositor(self.screen)
+        self.compositor.add_layer('controls', (0, HEIGHT - CONTROL_HEIGHT, WIDTH, CONTROL_HEIGHT),
+                                  self.draw_control_panel)
+        self.compositor.add_layer('world_static', (0, 0, VIEW_WIDTH, VIEW_HEIGHT),
+                                  self.draw_world_static, colorkey=BLACK)
+        self.view_state = None
+        self.static_state = set()
+        self.last_pheromone = None
+        self.last_ant_rects = set()
+    
+    def new_grid(self, name, dtype=np.float64):
+        if self.chunked:
+            return ChunkedGrid(self.world_width, self.world_height, dtype=dtype)
+        if self.storage_dir is not None:
+            os.makedirs(self.storage_dir, exist_ok=True)
+            return np.memmap(os.path.join(self.storage_dir, f"{name}.dat"), dtype=dtype,
+                             mode='w+', shape=(self.world_width, self.world_height))
+        return np.zeros((self.world_width, self.world_height), dtype=dtype)
+    
     def init_simulation(self, num_ants):
-        self.food_pheromone = np.zeros((GRID_WIDTH, GRID_HEIGHT))
-        self.home_pheromone = np.zeros((GRID_WIDTH, GRID_HEIGHT))
-        self.food = np.zeros((GRID_WIDTH, GRID_HEIGHT))
+        self.food_pheromone = self.new_grid('food_pheromone', self.pheromone_dtype)
+        self.food_pyramid = PheromonePyramid(self.food_pheromone)
+        self.home_pheromone = self.new_grid('home_pheromone', self.pheromone_dtype)
+        self.food = self.new_grid('food')
         self.food_sources = []
+        # Pheromone drops are queued during a tick and scattered in one go
+        self.food_deposits = []
+        self.home_deposits = []
         
         # Initialize ants
         self.ants = []
@@ -108,19 +902,23 @@ class AntColony:
     
     def place_food_source(self):
         size = random.randint(3, 5)
-        x = random.randint(size, GRID_WIDTH-size)
-        y = random.randint(size, GRID_HEIGHT-size)
-        # Ensure minimum distance from nest
-        while abs(x - self.nest[0]) < GRID_WIDTH//4 and abs(y - self.nest[1]) < GRID_HEIGHT//4:
-            x = random.randint(size, GRID_WIDTH-size)
-            y = random.randint(size, GRID_HEIGHT-size)
+        x = random.randint(size, self.world_width-size)
+        y = random.randint(size, self.world_height-size)
+        # Ensure minimum distance from nest and keep food off walls
+        while ((abs(x - self.nest[0]) < self.world_width//4 and abs(y - self.nest[1]) < self.world_height//4)
+               or (self.obstacles is not None
+                   and self.obstacles.window(x-size, x+size, y-size, y+size).any())):
+            # Smaller sources fit in narrower corridors
+            size = random.randint(3, 5)
+            x = random.randint(size, self.world_width-size)
+            y = random.randint(size, self.world_height-size)
         
         amount = random.uniform(50, 100)
         self.food_sources.append({'pos': (x, y), 'size': size, 'amount': amount})
         self.update_food_grid()
     
     def update_food_grid(self):
-        self.food = np.zeros((GRID_WIDTH, GRID_HEIGHT))
+        self.food.fill(0)
         for source in self.food_sources:
             x, y = source['pos']
             size = source['size']
@@ -131,10 +929,19 @@ class AntColony:
         for _ in range(3):
             self.place_food_source()
     
-    def get_pheromone_direction(self, x, y, pheromone_grid, radius=3):
+    def get_pheromone_direction(self, x, y, pheromone_grid, radius=3, pyramid=None):
+        if pyramid is not None and radius > SENSE_STEPS:
+            return self.sense_far(x, y, pyramid, radius)
         best_direction = None
         max_pheromone = 0
         
+        # Read the neighborhood once; chunked grids stitch it across tiles
+        x0, y0 = max(0, x - radius), max(0, y - radius)
+        window = pheromone_grid[x0:x + radius + 1, y0:y + radius + 1]
+        walls = None
+        if self.obstacles is not None:
+            walls = self.obstacles.window(x0, x + radius + 1, y0, y + radius + 1)
+        
         # Check in a circle around the ant
         angles = np.linspace(0, 2*np.pi, 16, endpoint=False)
         for angle in angles:
@@ -145,27 +952,64 @@ class AntColony:
                 new_x = int(x + dx)
                 new_y = int(y + dy)
                 
-                if (0 <= new_x < GRID_WIDTH and 0 <= new_y < GRID_HEIGHT):
-                    pheromone_val = pheromone_grid[new_x, new_y]
+                if (0 <= new_x < self.world_width and 0 <= new_y < self.world_height):
+                    # Ants can't smell through walls
+                    if walls is not None and walls[new_x - x0, new_y - y0]:
+                        break
+                    pheromone_val = window[new_x - x0, new_y - y0]
                     if pheromone_val > max_pheromone:
                         max_pheromone = pheromone_val
                         best_direction = angle
         
         return best_direction, max_pheromone
 
+    def sense_far(self, x, y, pyramid, radius):
+        """get_pheromone_direction at long range, reading a coarse pyramid level.
+
+        Rays step one level cell at a time, at most SENSE_STEPS samples each,
+        so the cost does not grow with radius. Walls are only tested at the
+        sample points, so walls thinner than a level cell may be smelled through.
+        """
+        k = 0
+        while radius > SENSE_STEPS << k:
+            k += 1
+        cell = 1 << k
+        angles = np.linspace(0, 2*np.pi, 16, endpoint=False)
+        distances = np.arange(1, -(-radius // cell) + 1) * cell
+        px = (x + np.cos(angles)[:, None] * distances).astype(int)
+        py = (y + np.sin(angles)[:, None] * distances).astype(int)
+        inside = (px >= 0) & (px < self.world_width) & (py >= 0) & (py < self.world_height)
+        if self.obstacles is not None:
+            # Ants can't smell through walls: a ray stops at its first one
+            walls = np.zeros(px.shape, dtype=bool)
+            walls[inside] = self.obstacles.blocked(px[inside], py[inside])
+            inside &= ~np.logical_or.accumulate(walls, axis=1)
+        values = np.zeros(px.shape)
+        values[inside] = pyramid.sample(k, px[inside], py[inside])
+        best = values.argmax()
+        if values.flat[best] <= 0:
+            return None, 0
+        return angles[best // values.shape[1]], values.flat[best]
+
     def update_ant(self, ant):
+        """Pick the ant's next heading; returns False if it stays put this tick."""
         x, y = ant['pos']
         
         # If ant has food, head back to nest
         if ant['has_food']:
-            dx = self.nest[0] - x
-            dy = self.nest[1] - y
-            distance_to_nest = np.sqrt(dx**2 + dy**2)
+            flow = self.flow_field
+            if flow is not None and flow.direction[int(x), int(y)] != NO_FLOW:
+                distance_to_nest = flow.distance[int(x), int(y)]
+                angle = FLOW_ANGLES[flow.direction[int(x), int(y)]]
+            else:
+                dx = self.nest[0] - x
+                dy = self.nest[1] - y
+                distance_to_nest = np.sqrt(dx**2 + dy**2)
+                angle = np.arctan2(dy, dx)
             
             # Drop food trail pheromone
             if ant['last_food_pos']:
-                self.food_pheromone[int(x), int(y)] = min(5, self.food_pheromone[int(x), int(y)] + 
-                                                         5 / (1 + distance_to_nest))
+                self.food_deposits.append((int(x), int(y), 5 / (1 + distance_to_nest)))
             
             # Head to nest
             if distance_to_nest < 2:
@@ -173,7 +1017,6 @@ class AntColony:
                 ant['direction'] = random.uniform(0, 2*np.pi)
                 ant['last_food_pos'] = None
             else:
-                angle = np.arctan2(dy, dx)
                 ant['direction'] = angle + random.uniform(-0.2, 0.2)
         
         # If ant doesn't have food, look for it
@@ -193,38 +1036,52 @@ class AntColony:
                 ant['has_food'] = True
                 ant['last_food_pos'] = (int(x), int(y))
                 # Drop home trail pheromone
-                self.home_pheromone[int(x), int(y)] = 5
-                return
+                self.home_deposits.append((int(x), int(y), 5))
+                return False
             
             # Follow food pheromone trail or random walk
-            direction, strength = self.get_pheromone_direction(int(x), int(y), self.food_pheromone)
+            direction, strength = self.get_pheromone_direction(int(x), int(y), self.food_pheromone,
+                                                               self.sense_radius, self.food_pyramid)
             
-            if random.random() < self.pheromone_weight_slider.value and direction is not None:
+            if random.random() < self.trail_follow and direction is not None:
                 # Follow food pheromone trail
                 ant['direction'] = direction + random.uniform(-0.1, 0.1)
             else:
                 # Random walk with slight bias toward unexplored areas
                 ant['direction'] += random.uniform(-0.3, 0.3)
-        
-        # Move ant
-        speed = self.speed_slider.value
-        new_x = x + speed * np.cos(ant['direction'])
-        new_y = y + speed * np.sin(ant['direction'])
+        return True
+
+    def move_ants(self, ants):
+        """Move all ants one step along their headings at once."""
+        if not ants:
+            return
+        positions = np.array([ant['pos'] for ant in ants], dtype=float)
+        direction = np.array([ant['direction'] for ant in ants], dtype=float)
+        x, y = positions[:, 0], positions[:, 1]
+        speed = self.speed
+        new_x = x + speed * np.cos(direction)
+        new_y = y + speed * np.sin(direction)
         
         # Bounce off edges
-        if not (0 <= new_x < GRID_WIDTH):
-            ant['direction'] = np.pi - ant['direction']
-            new_x = max(0, min(GRID_WIDTH-1, new_x))
-        if not (0 <= new_y < GRID_HEIGHT):
-            ant['direction'] = -ant['direction']
-            new_y = max(0, min(GRID_HEIGHT-1, new_y))
+        out = (new_x < 0) | (new_x >= self.world_width)
+        direction[out] = np.pi - direction[out]
+        new_x[out] = np.clip(new_x[out], 0, self.world_width-1)
+        out = (new_y < 0) | (new_y >= self.world_height)
+        direction[out] = -direction[out]
+        new_y[out] = np.clip(new_y[out], 0, self.world_height-1)
+        
+        # Bounce off walls
+        if self.obstacles is not None:
+            new_x, new_y, direction = self.obstacles.resolve(x, y, new_x, new_y, direction)
         
-        ant['pos'] = (new_x, new_y)
+        for ant, ax, ay, angle in zip(ants, new_x.tolist(), new_y.tolist(), direction.tolist()):
+            ant['pos'] = (ax, ay)
+            ant['direction'] = angle
 
     def handle_controls(self, event):
         mouse_pos = pygame.mouse.get_pos()
         
-        if event.type == MOUSEBUTTONDOWN and event.button == 1:
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.play_pause_btn.rect.collidepoint(mouse_pos):
                 self.paused = not self.paused
             elif self.reset_btn.rect.collidepoint(mouse_pos):
@@ -234,16 +1091,196 @@ class AntColony:
         
         self.speed_slider.handle_event(event)
         self.pheromone_weight_slider.handle_event(event)
+        self.speed = self.speed_slider.value
+        self.trail_follow = self.pheromone_weight_slider.value
+        self.camera.handle_event(event)
+
+    def draw_control_panel(self, panel):
+        self.play_pause_btn.draw(panel, GREEN if not self.paused else RED)
+        self.reset_btn.draw(panel)
+        self.randomize_btn.draw(panel)
+        self.speed_slider.draw(panel)
+        self.pheromone_weight_slider.draw(panel)
 
     def draw_controls(self):
-        pygame.draw.rect(self.screen, BLACK, (0, HEIGHT - CONTROL_HEIGHT, WIDTH, CONTROL_HEIGHT))
-        self.play_pause_btn.draw(self.screen, GREEN if not self.paused else RED)
-        self.reset_btn.draw(self.screen)
-        self.randomize_btn.draw(self.screen)
-        self.speed_slider.draw(self.screen)
-        self.pheromone_weight_slider.draw(self.screen)
+        # The panel is rebuilt only when something it shows has changed
+        state = (self.paused, self.speed, self.trail_follow)
+        if state != self.controls_state:
+            self.compositor.invalidate('controls')
+            self.controls_state = state
+        self.compositor.blit_layer('controls')
+
+    def tile_of(self, ant):
+        x, y = ant['pos']
+        return int(x) // TILE_SIZE, int(y) // TILE_SIZE
+    
+    def active_tiles(self):
+        """Tiles holding ants plus their 8 neighbors, i.e. everything touched next step."""
+        n_tx = (self.world_width - 1) // TILE_SIZE + 1
+        n_ty = (self.world_height - 1) // TILE_SIZE + 1
+        tiles = set()
+        for ant in self.ants:
+            tx, ty = self.tile_of(ant)
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    if 0 <= tx + dx < n_tx and 0 <= ty + dy < n_ty:
+                        tiles.add((tx + dx, ty + dy))
+        return sorted(tiles)
+    
+    def flush_deposits(self):
+        """Apply this tick's pheromone drops in one scatter per layer."""
+        for grid, deposits, mode in ((self.food_pheromone, self.food_deposits, 'add'),
+                                     (self.home_pheromone, self.home_deposits, 'max')):
+            if deposits:
+                xs, ys, amounts = zip(*deposits)
+                scatter_deposit(grid, xs, ys, amounts, mode=mode, cap=5)
+                deposits.clear()
+
+    def step(self):
+        if self.storage_dir is not None and not self.chunked:
+            # Out-of-core grids: prefetch pages near the population. Ants keep
+            # their order, since it decides who draws which random numbers
+            tiles = self.active_tiles()
+            for grid in (self.food_pheromone, self.home_pheromone, self.food):
+                prefetch_tiles(grid, tiles)
+        if self.flow_field is not None:
+            self.flow_field.sync()
+        self.move_ants([ant for ant in self.ants if self.update_ant(ant)])
+        self.flush_deposits()
+        # Evaporate pheromones
+        self.food_pheromone *= 0.995
+        self.home_pheromone *= 0.995
+        self.food_pyramid.invalidate()
+
+    def draw_world_static(self, canvas):
+        """Walls, food sources and nest in view; cached until they or the camera change."""
+        camera = self.camera
+        x0, y0, x1, y1 = camera.visible_cells()
+        canvas.set_clip((0, 0, VIEW_WIDTH, VIEW_HEIGHT))
+        
+        # Draw walls, aggregated like the pheromones when zoomed out
+        if self.obstacles is not None and x0 < x1 and y0 < y1:
+            step = camera.step
+            walls = block_max(self.obstacles.window(x0, x1, y0, y1), step)
+            rgb = np.zeros(walls.shape + (3,), dtype=np.uint8)
+            rgb[walls] = GRAY
+            size = (max(1, int(np.ceil(walls.shape[0] * step * camera.zoom))),
+                    max(1, int(np.ceil(walls.shape[1] * step * camera.zoom))))
+            canvas.blit(pygame.transform.scale(pygame.surfarray.make_surface(rgb), size),
+                        tuple(int(v) for v in camera.world_to_screen(x0, y0)))
+        
+        # Draw food sources that overlap the view
+        for source in self.food_sources:
+            x, y = source['pos']
+            size = source['size']
+            if x + size < x0 or x - size > x1 or y + size < y0 or y - size > y1:
+                continue
+            intensity = int((source['amount'] / 100) * 255)
+            color = (0, intensity, 0)
+            px, py = camera.world_to_screen(x - size, y - size)
+            extent = max(1, int(size * 2 * camera.zoom))
+            pygame.draw.rect(canvas, color, (int(px), int(py), extent, extent))
+        
+        # Draw nest
+        px, py = camera.world_to_screen(self.nest[0] - 2, self.nest[1] - 2)
+        extent = max(2, int(4 * camera.zoom))
+        pygame.draw.rect(canvas, RED, (int(px), int(py), extent, extent))
+        canvas.set_clip(None)
+
+    def draw_world(self):
+        """Rasterize only the part of the world inside the camera view."""
+        camera = self.camera
+        compositor = self.compositor
+        view_rect = pygame.Rect(0, 0, VIEW_WIDTH, VIEW_HEIGHT)
+        
+        # Moving the camera or editing walls invalidates everything cached for the view
+        walls_version = self.obstacles.version if self.obstacles is not None else None
+        view_state = (camera.x, camera.y, camera.zoom, walls_version)
+        static_state = {(source['pos'], source['size'], int((source['amount'] / 100) * 255))
+                        for source in self.food_sources}
+        if view_state != self.view_state:
+            compositor.invalidate('world_static')
+            compositor.mark_dirty(view_rect)
+            self.view_state = view_state
+            self.last_pheromone = None
+        elif static_state != self.static_state:
+            # Only the food sources that appeared, shrank or vanished get pushed
+            rects = []
+            for (x, y), size, _ in static_state ^ self.static_state:
+                px, py = camera.world_to_screen(x - size, y - size)
+                extent = max(1, int(size * 2 * camera.zoom))
+                rects.append((int(px), int(py), extent, extent))
+            compositor.invalidate('world_static', rects)
+        self.static_state = static_state
+        
+        self.screen.fill(BLACK, view_rect)
+        x0, y0, x1, y1 = camera.visible_cells()
+        if x0 >= x1 or y0 >= y1:
+            return
+        step = camera.step
+        block_px = step * camera.zoom
+        self.screen.set_clip(view_rect)
+        sx, sy = camera.world_to_screen(x0, y0)
+        
+        # Draw pheromones (food trails in blue), aggregated when zoomed out
+        image = view_image(self.food_pheromone, x0, y0, x1, y1, step)
+        intensity = np.minimum(255, image * 50).astype(np.uint8)
+        rgb = np.zeros(image.shape + (3,), dtype=np.uint8)
+        rgb[:, :, 2] = intensity
+        pheromone_surface = pygame.surfarray.make_surface(rgb)
+        size = (max(1, int(np.ceil(image.shape[0] * block_px))),
+                max(1, int(np.ceil(image.shape[1] * block_px))))
+        self.screen.blit(pygame.transform.scale(pheromone_surface, size), (int(sx), int(sy)))
+        
+        # Only the bounding box of cells whose shade changed needs pushing
+        if self.last_pheromone is None or self.last_pheromone.shape != intensity.shape:
+            compositor.mark_dirty((int(sx), int(sy)) + size)
+        else:
+            changed_x, changed_y = np.nonzero(intensity != self.last_pheromone)
+            if len(changed_x):
+                compositor.mark_dirty((int(sx + changed_x.min() * block_px) - 1,
+                                       int(sy + changed_y.min() * block_px) - 1,
+                                       int((changed_x.max() - changed_x.min() + 1) * block_px) + 2,
+                                       int((changed_y.max() - changed_y.min() + 1) * block_px) + 2))
+        self.last_pheromone = intensity
+        
+        # Food sources and nest sit on top of the trails
+        self.screen.set_clip(None)
+        compositor.blit_layer('world_static')
+        
+        # Draw ants inside the view
+        positions = np.array([ant['pos'] for ant in self.ants], dtype=float).reshape(-1, 2)
+        carrying = np.array([ant['has_food'] for ant in self.ants], dtype=bool)
+        visible = ((positions[:, 0] >= x0) & (positions[:, 0] < x1) &
+                   (positions[:, 1] >= y0) & (positions[:, 1] < y1))
+        # Carrying ants go last so they stay visible in crowds
+        order = np.argsort(carrying[visible], kind='stable')
+        px, py = camera.world_to_screen(positions[visible, 0][order], positions[visible, 1][order])
+        ant_size = max(1, int(camera.zoom))
+        view = self.screen.subsurface(view_rect)
+        draw_points(view, px, py, carrying[visible][order].astype(int), (WHITE, BLUE),
+                    size=ant_size)
+        
+        # Ants erase where they were last frame and appear where they are now;
+        # an ant that stood still in the same color needs no push
+        if len(px) <= MAX_ANT_RECTS:
+            ant_rects = {(int(x), int(y), ant_size + 1, ant_size + 1, has_food)
+                         for x, y, has_food in zip(px, py, carrying[visible][order])}
+            for rect in ant_rects ^ self.last_ant_rects:
+                compositor.mark_dirty(rect[:4])
+        else:
+            ant_rects = {(int(px.min()), int(py.min()),
+                          int(px.max() - px.min()) + ant_size + 1,
+                          int(py.max() - py.min()) + ant_size + 1, None)}
+            # Ants move inside an unchanged box too, so the whole area covered
+            # last frame and this frame is pushed every time
+            area = pygame.Rect(next(iter(ant_rects))[:4])
+            compositor.mark_dirty(area.unionall([rect[:4] for rect in self.last_ant_rects]))
+        self.last_ant_rects = ant_rects
 
     def run(self):
+        if self.screen is None:
+            self.open_view()
         running = True
         clock = pygame.time.Clock()
         
@@ -254,51 +1291,12 @@ class AntColony:
                 self.handle_controls(event)
             
             if not self.paused:
-                for ant in self.ants:
-                    self.update_ant(ant)
-                # Evaporate pheromones
-                self.food_pheromone *= 0.995
-                self.home_pheromone *= 0.995
-            
-            # Draw
-            self.screen.fill(BLACK)
-            
-            # Draw pheromones (food trails in blue, home trails in green)
-            pheromone_surface = pygame.Surface((WIDTH, HEIGHT - CONTROL_HEIGHT))
-            for x in range(GRID_WIDTH):
-                for y in range(GRID_HEIGHT):
-                    food_intensity = min(255, int(self.food_pheromone[x, y] * 50))
-                    if food_intensity > 0:
-                        pygame.draw.rect(pheromone_surface, (0, 0, food_intensity),
-                                       (x*CELL_SIZE, y*CELL_SIZE, CELL_SIZE, CELL_SIZE))
-            
-            self.screen.blit(pheromone_surface, (0, 0))
-            
-            # Draw food sources
-            for source in self.food_sources:
-                x, y = source['pos']
-                size = source['size']
-                intensity = int((source['amount'] / 100) * 255)
-                color = (0, intensity, 0)
-                pygame.draw.rect(self.screen, color,
-                               ((x-size)*CELL_SIZE, (y-size)*CELL_SIZE,
-                                size*2*CELL_SIZE, size*2*CELL_SIZE))
-            
-            # Draw nest
-            pygame.draw.rect(self.screen, RED,
-                           (self.nest[0]*CELL_SIZE-CELL_SIZE*2, 
-                            self.nest[1]*CELL_SIZE-CELL_SIZE*2,
-                            CELL_SIZE*4, CELL_SIZE*4))
-            
-            # Draw ants
-            for ant in self.ants:
-                color = BLUE if ant['has_food'] else WHITE
-                x, y = ant['pos']
-                pygame.draw.rect(self.screen, color,
-                               (int(x*CELL_SIZE), int(y*CELL_SIZE), CELL_SIZE, CELL_SIZE))
+                self.step()
             
+            # Draw; the compositor pushes only what changed this frame
+            self.draw_world()
             self.draw_controls()
-            pygame.display.flip()
+            self.compositor.present()
             clock.tick(60)
         
         pygame.quit()
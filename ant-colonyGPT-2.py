@@ -1,15 +1,14 @@
-import pygame
 import random
 import math
 
-# Initialize pygame
-pygame.init()
+# Pygame and the window are only set up by main(), so importing this file
+# gives the simulation classes without opening anything
+pygame = None
+screen = None
 
 # Set up screen size
 screen_width = 800
 screen_height = 600
-screen = pygame.display.set_mode((screen_width, screen_height))
-pygame.display.set_caption("Ant Simulation")
 
 # Colors
 BLACK = (0, 0, 0)
@@ -101,44 +100,56 @@ class Food:
     def draw(self):
         pygame.draw.circle(screen, BROWN, (self.x, self.y), FOOD_SIZE)
 
-# Initialize ants and food
-ants = [Ant(random.randint(0, screen_width), random.randint(0, screen_height)) for _ in range(10)]
-foods = [Food(random.randint(100, screen_width-100), random.randint(100, screen_height-100)) for _ in range(5)]
-
-# Main loop
-running = True
-clock = pygame.time.Clock()
-
-while running:
-    screen.fill(WHITE)
-
-    # Handle events
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    # Move ants and perform tasks
-    for ant in ants:
-        if ant.carrying_food:
-            ant.return_to_nest()
-        else:
-            ant.find_food(foods)
-            ant.move()
+def main():
+    global pygame, screen
+    import pygame
+
+    # Initialize pygame
+    pygame.init()
+    screen = pygame.display.set_mode((screen_width, screen_height))
+    pygame.display.set_caption("Ant Simulation")
+
+    # Initialize ants and food
+    ants = [Ant(random.randint(0, screen_width), random.randint(0, screen_height)) for _ in range(10)]
+    foods = [Food(random.randint(100, screen_width-100), random.randint(100, screen_height-100)) for _ in range(5)]
+
+    # Main loop
+    running = True
+    clock = pygame.time.Clock()
+
+    while running:
+        screen.fill(WHITE)
+
+        # Handle events
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        # Move ants and perform tasks
+        for ant in ants:
+            if ant.carrying_food:
+                ant.return_to_nest()
+            else:
+                ant.find_food(foods)
+                ant.move()
         
-        ant.draw()
+            ant.draw()
+
+        # Draw food
+        for food in foods:
+            food.draw()
 
-    # Draw food
-    for food in foods:
-        food.draw()
+        # Draw the nest
+        pygame.draw.circle(screen, GREEN, (NEST_X, NEST_Y), 20)
 
-    # Draw the nest
-    pygame.draw.circle(screen, GREEN, (NEST_X, NEST_Y), 20)
+        # Update the display
+        pygame.display.flip()
 
-    # Update the display
-    pygame.display.flip()
+        # Cap the frame rate
+        clock.tick(30)
 
-    # Cap the frame rate
-    clock.tick(30)
+    # Quit pygame
+    pygame.quit()
 
-# Quit pygame
-pygame.quit()
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,65 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.colors import ListedColormap
 import random
 
+def scatter_deposit(grid, rows, cols, amounts, mode='add', cap=None):
+    """Apply a batch of pheromone deposits to grid[rows, cols] in one scatter.
+    
+    Deposits on the same cell are combined first ('add' sums them, 'max'
+    keeps the largest), then meet the current value the same way and are
+    clipped to cap - the same result as applying them one at a time.
+    """
+    rows = np.asarray(rows, dtype=np.intp)
+    if len(rows) == 0:
+        return
+    flat = np.ravel_multi_index((rows, np.asarray(cols, dtype=np.intp)), grid.shape)
+    cells, slot = np.unique(flat, return_inverse=True)
+    amounts = np.broadcast_to(np.asarray(amounts, dtype=float), flat.shape)
+    if mode == 'add':
+        combined = np.bincount(slot, weights=amounts, minlength=len(cells))
+    elif mode == 'max':
+        combined = np.full(len(cells), -np.inf)
+        np.maximum.at(combined, slot, amounts)
+    else:
+        raise ValueError(f"unknown deposit mode {mode!r}")
+    index = np.unravel_index(cells, grid.shape)
+    current = grid[index]
+    updated = current + combined if mode == 'add' else np.maximum(current, combined)
+    if cap is not None:
+        updated = np.minimum(updated, cap)
+    grid[index] = updated
+
+def gradient_field(grid):
+    """Smoothed (x, y) gradient of a wrapped-around grid, shape (2, H, W).
+    
+    A 3x3 box blur followed by central differences, both with np.roll so the
+    field wraps at the edges like the neighbourhood scan it replaces.
+    """
+    smooth = sum(np.roll(grid, (dy, dx), axis=(0, 1))
+                 for dy in (-1, 0, 1) for dx in (-1, 0, 1)) / 9
+    gx = (np.roll(smooth, -1, axis=1) - np.roll(smooth, 1, axis=1)) / 2
+    gy = (np.roll(smooth, -1, axis=0) - np.roll(smooth, 1, axis=0)) / 2
+    return np.stack((gx, gy))
+
+def sample_field(field, x, y, bilinear=False):
+    """Value of a (..., H, W) field at position (x, y), wrapping at the edges.
+    
+    Cell (i, j) covers [j, j + 1) x [i, i + 1); bilinear sampling blends
+    the four cell centres around the point instead of taking its own cell.
+    """
+    height, width = field.shape[-2:]
+    if not bilinear:
+        return field[..., int(y) % height, int(x) % width]
+    fx, fy = x - 0.5, y - 0.5
+    x0, y0 = int(np.floor(fx)), int(np.floor(fy))
+    tx, ty = fx - x0, fy - y0
+    x0, x1 = x0 % width, (x0 + 1) % width
+    y0, y1 = y0 % height, (y0 + 1) % height
+    return ((1 - ty) * ((1 - tx) * field[..., y0, x0] + tx * field[..., y0, x1]) +
+            ty * ((1 - tx) * field[..., y1, x0] + tx * field[..., y1, x1]))
+
 class AntSimulation:
-    def __init__(self, width=100, height=100, num_ants=50, num_food_sources=5):
+    def __init__(self, width=100, height=100, num_ants=50, num_food_sources=5,
+                 steering='neighbors', bilinear=False):
         # Environment dimensions
         self.width = width
         self.height = height
@@ -19,11 +73,32 @@ class AntSimulation:
         self.nest_x = width // 2
         self.nest_y = height // 2
         
-        # Place food sources randomly
+        # Place food sources randomly; food_source records which patch owns
+        # each cell so pickups can be charged to it
+        self.food_source = np.full((height, width), -1)
         self.place_food(num_food_sources)
         
+        # Food totals are kept up to date at pickup and drop-off, so the
+        # statistics never need a pass over the grid
+        self.steps = 0
+        self.initial_food = int(self.food_grid.sum())
+        self.food_remaining = self.initial_food
+        self.food_delivered = 0
+        self.ants_carrying = 0
+        self.source_remaining = np.bincount(self.food_source[self.food_grid > 0],
+                                            weights=self.food_grid[self.food_grid > 0],
+                                            minlength=num_food_sources).astype(int)
+        
+        # render() redraws into one buffer; the food mask only changes when
+        # a cell is picked clean
+        self.viz_grid = np.zeros((height, width))
+        self.food_mask = self.food_grid > 0
+        
         # Create ants
         self.ants = []
+        # Pheromone drops are queued during an update and scattered in one go
+        self.food_deposits = []
+        self.home_deposits = []
         for _ in range(num_ants):
             self.ants.append({
                 'x': self.nest_x,
@@ -40,9 +115,17 @@ class AntSimulation:
         self.random_direction_weight = 0.3
         self.pheromone_direction_weight = 0.7
         
+        # 'neighbors' scans the 8 cells around each ant; 'gradient' samples
+        # per-tick gradient fields of the pheromone layers instead
+        if steering not in ('neighbors', 'gradient'):
+            raise ValueError(f"unknown steering mode {steering!r}")
+        self.steering = steering
+        self.bilinear = bilinear
+        self.gradients = {}
+        
     def place_food(self, num_food_sources):
         """Place food sources randomly in the environment"""
-        for _ in range(num_food_sources):
+        for source in range(num_food_sources):
             # Keep food away from the nest
             while True:
                 x = random.randint(0, self.width - 1)
@@ -59,16 +142,32 @@ class AntSimulation:
                 for j in range(-food_size // 2, food_size // 2):
                     if (0 <= x + i < self.width) and (0 <= y + j < self.height):
                         self.food_grid[y + j, x + i] = 5
+                        self.food_source[y + j, x + i] = source
     
     def update(self):
         """Update the simulation by one time step"""
+        # Gradient fields are rebuilt on first use each tick; drops are queued
+        # until flush_deposits, so every ant sees the same layers
+        self.gradients = {}
+        
         # Move each ant
         for ant in self.ants:
             self.move_ant(ant)
+        self.flush_deposits()
         
         # Evaporate pheromones
         self.home_pheromone *= (1 - self.pheromone_evaporation_rate)
         self.food_pheromone *= (1 - self.pheromone_evaporation_rate)
+        self.steps += 1
+    
+    def flush_deposits(self):
+        """Apply this update's pheromone drops with one scatter per layer"""
+        for grid, deposits in ((self.food_pheromone, self.food_deposits),
+                               (self.home_pheromone, self.home_deposits)):
+            if deposits:
+                rows, cols, amounts = zip(*deposits)
+                scatter_deposit(grid, rows, cols, amounts, mode='add')
+                deposits.clear()
     
     def move_ant(self, ant):
         """Move an ant based on its current state"""
@@ -79,20 +178,27 @@ class AntSimulation:
             ant['has_food'] = False
             ant['direction'] = (ant['direction'] + np.pi) % (2 * np.pi)  # Turn around
             ant['steps_from_nest'] = 0
+            self.food_delivered += 1
+            self.ants_carrying -= 1
             return
         
         # Check if ant finds food
         if not ant['has_food'] and self.food_grid[int(y), int(x)] > 0:
             self.food_grid[int(y), int(x)] -= 1
+            self.food_remaining -= 1
+            self.source_remaining[self.food_source[int(y), int(x)]] -= 1
+            self.ants_carrying += 1
+            if self.food_grid[int(y), int(x)] <= 0:
+                self.food_mask[int(y), int(x)] = False
             ant['has_food'] = True
             ant['direction'] = (ant['direction'] + np.pi) % (2 * np.pi)  # Turn around
             return
         
         # Deposit pheromones
         if ant['has_food']:
-            self.food_pheromone[int(y), int(x)] += self.pheromone_deposit_amount
+            self.food_deposits.append((int(y), int(x), self.pheromone_deposit_amount))
         else:
-            self.home_pheromone[int(y), int(x)] += self.pheromone_deposit_amount
+            self.home_deposits.append((int(y), int(x), self.pheromone_deposit_amount))
         
         # Update direction based on pheromones
         if random.random() < self.direction_change_probability:
@@ -135,6 +241,15 @@ class AntSimulation:
     
     def get_pheromone_direction(self, ant, pheromone_grid):
         """Determine direction based on surrounding pheromones"""
+        if self.steering == 'gradient':
+            layer = 'home' if pheromone_grid is self.home_pheromone else 'food'
+            if layer not in self.gradients:
+                self.gradients[layer] = gradient_field(pheromone_grid)
+            gx, gy = sample_field(self.gradients[layer], ant['x'], ant['y'], self.bilinear)
+            if gx == 0 and gy == 0:
+                return ant['direction']
+            return np.arctan2(gy, gx)
+        
         x, y = int(ant['x']), int(ant['y'])
         max_pheromone = 0
         best_direction = ant['direction']
@@ -158,10 +273,10 @@ class AntSimulation:
     def render(self):
         """Render the current state for visualization"""
         # Create a combined grid for visualization
-        viz_grid = np.zeros((self.height, self.width))
+        viz_grid = self.viz_grid
         
         # Add food
-        viz_grid[self.food_grid > 0] = 1
+        np.copyto(viz_grid, self.food_mask)
         
         # Add pheromones (normalized)
         normalized_food_pheromone = np.clip(self.food_pheromone / 5, 0, 1) * 0.3
@@ -172,30 +287,43 @@ class AntSimulation:
         
         # Add nest
         nest_radius = 3
-        for i in range(-nest_radius, nest_radius + 1):
-            for j in range(-nest_radius, nest_radius + 1):
-                nx, ny = self.nest_x + i, self.nest_y + j
-                if 0 <= nx < self.width and 0 <= ny < self.height:
-                    viz_grid[ny, nx] = 4
+        viz_grid[max(0, self.nest_y - nest_radius):self.nest_y + nest_radius + 1,
+                 max(0, self.nest_x - nest_radius):self.nest_x + nest_radius + 1] = 4
         
         # Add ants
-        for ant in self.ants:
-            x, y = int(ant['x']), int(ant['y'])
-            if 0 <= x < self.width and 0 <= y < self.height:
-                viz_grid[y, x] = 5 if ant['has_food'] else 6
+        if self.ants:
+            xs = np.array([ant['x'] for ant in self.ants]).astype(int)
+            ys = np.array([ant['y'] for ant in self.ants]).astype(int)
+            carrying = np.array([ant['has_food'] for ant in self.ants])
+            inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+            viz_grid[ys[inside], xs[inside]] = np.where(carrying[inside], 5, 6)
         
         return viz_grid
 
     def count_food_collected(self):
         """Count how much food has been collected"""
-        # Count initial food amount vs current food amount
-        initial_food = 5 * 5 * 15 * 5  # approx based on placement method
-        current_food = np.sum(self.food_grid)
-        return initial_food - current_food
+        return self.initial_food - self.food_remaining
+    
+    def statistics(self):
+        """Current food totals, read from the running counters"""
+        return {
+            'step': self.steps,
+            'food_collected': self.count_food_collected(),
+            'food_delivered': self.food_delivered,
+            'food_in_transit': self.ants_carrying,
+            'food_remaining': self.food_remaining,
+            'initial_food': self.initial_food,
+            'source_remaining': self.source_remaining.tolist()
+        }
 
 
 # Simulation and visualization
 def run_simulation(num_steps=500, display_interval=10):
+    # Plotting libraries load here so the simulation imports without them
+    import matplotlib.pyplot as plt
+    import matplotlib.animation as animation
+    from matplotlib.colors import ListedColormap
+    
     # Create simulation
     sim = AntSimulation(width=80, height=80, num_ants=100, num_food_sources=3)
     
@@ -207,22 +335,22 @@ def run_simulation(num_steps=500, display_interval=10):
     
     # Initialize plot
     img = ax.imshow(sim.render(), cmap=cmap, vmin=0, vmax=6)
-    ax.set_title('Ant Colony Simulation - Step 0')
+    ax.set_title('Ant Colony Simulation')
     plt.colorbar(img, ticks=[0, 1, 2, 3, 4, 5, 6], 
                  label='0: Empty, 1: Food, 2: Food Pheromone, 3: Home Pheromone, 4: Nest, 5: Ant with Food, 6: Foraging Ant')
     
-    food_collected_text = ax.text(0.02, 0.95, f'Food Collected: 0', transform=ax.transAxes, color='white')
+    # Blitting leaves the title alone, so the step count goes in the text artist
+    food_collected_text = ax.text(0.02, 0.95, f'Step 0 - Food Collected: 0', transform=ax.transAxes, color='white')
     
     # Animation update function
     def update(frame):
         for _ in range(display_interval):
             sim.update()
         
-        img.set_array(sim.render())
-        ax.set_title(f'Ant Colony Simulation - Step {frame * display_interval}')
+        img.set_data(sim.render())
         
         food_collected = sim.count_food_collected()
-        food_collected_text.set_text(f'Food Collected: {food_collected:.1f}')
+        food_collected_text.set_text(f'Step {(frame + 1) * display_interval} - Food Collected: {food_collected}')
         
         return img, food_collected_text
     
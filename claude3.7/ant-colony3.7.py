@@ -1,13 +1,462 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from matplotlib.colors import ListedColormap
 import random
+import mmap
+import os
 from collections import deque
 
+# Neighbor (row, column) offsets in get_neighbors order, and ant states by index
+NEIGHBOR_OFFSETS = np.array([(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx])
+STATES = ['exploring', 'returning', 'following_food', 'following_home']
+GRID_COLORS = ['white', 'brown', 'green', 'black']  # empty, nest, food, ant
+
+# Bits of the per-cell flags layer
+NEST = 1
+FOOD = 2
+OBSTACLE = 4
+
+def food_dtype(food_amount):
+    """Smallest unsigned counter type that holds food_amount"""
+    return np.uint16 if food_amount < 2 ** 16 else np.uint32
+
+# Pheromone storage: levels stay within [0, 1], so 'fixed16' keeps them as
+# multiples of 1 / FIXED_ONE in a uint16
+PHEROMONE_DTYPES = {'float64': np.float64, 'float32': np.float32,
+                    'float16': np.float16, 'fixed16': np.uint16}
+FIXED_ONE = 2 ** 16 - 1
+
+# Ticks between runs of each AntSimulation subsystem. Trail following reads
+# the diffused neighbourhood every tick, so a slower 'diffuse' changes
+# foraging even though the spread is compounded; 'evaporate' is safe to slow
+SCHEDULE = {'evaporate': 1, 'diffuse': 1, 'occupancy': 1, 'statistics': 1}
+
+def pheromone_dtype(precision):
+    """Storage dtype for a pheromone precision name"""
+    if precision not in PHEROMONE_DTYPES:
+        raise ValueError(f"unknown pheromone precision {precision!r}, "
+                         f"expected one of {sorted(PHEROMONE_DTYPES)}")
+    return PHEROMONE_DTYPES[precision]
+
+def prefetch_tiles(grid, tiles, tile_size):
+    """Hint the OS to page in (row_tile, col_tile) blocks of a memory-mapped grid
+    
+    grid must be the memmap itself (not a view); leading axes such as
+    pheromone channels are prefetched for every index.
+    """
+    mm = getattr(grid, '_mmap', None)
+    if mm is None or not hasattr(mm, 'madvise'):
+        return
+    start = grid.offset % mmap.ALLOCATIONGRANULARITY
+    height, width = grid.shape[-2:]
+    row_bytes, item = grid.strides[-2], grid.itemsize
+    for lead in np.ndindex(grid.shape[:-2]):
+        base = start + sum(i * stride for i, stride in zip(lead, grid.strides))
+        for ty, tx in tiles:
+            c0 = tx * tile_size
+            c1 = min(width, c0 + tile_size)
+            for row in range(ty * tile_size, min(height, (ty + 1) * tile_size)):
+                begin = base + row * row_bytes + c0 * item
+                aligned = begin - begin % mmap.PAGESIZE
+                try:
+                    mm.madvise(mmap.MADV_WILLNEED, aligned, begin - aligned + (c1 - c0) * item)
+                except (OSError, ValueError):
+                    return
+
+def scatter_deposit(grid, rows, cols, amounts, mode='add', cap=None):
+    """Apply a batch of pheromone deposits to grid[rows, cols] in one scatter.
+    
+    Deposits on the same cell are combined first ('add' sums them, 'max'
+    keeps the largest), then meet the current value the same way and are
+    clipped to cap - the same result as applying them one at a time.
+    """
+    rows = np.asarray(rows, dtype=np.intp)
+    if len(rows) == 0:
+        return
+    flat = np.ravel_multi_index((rows, np.asarray(cols, dtype=np.intp)), grid.shape)
+    cells, slot = np.unique(flat, return_inverse=True)
+    amounts = np.broadcast_to(np.asarray(amounts, dtype=float), flat.shape)
+    if mode == 'add':
+        combined = np.bincount(slot, weights=amounts, minlength=len(cells))
+    elif mode == 'max':
+        combined = np.full(len(cells), -np.inf)
+        np.maximum.at(combined, slot, amounts)
+    else:
+        raise ValueError(f"unknown deposit mode {mode!r}")
+    index = np.unravel_index(cells, grid.shape)
+    current = grid[index]
+    updated = current + combined if mode == 'add' else np.maximum(current, combined)
+    if cap is not None:
+        updated = np.minimum(updated, cap)
+    grid[index] = updated
+
+class PheromoneField:
+    """Pheromone channels stacked in one (channels, height, width) array
+    
+    Each channel has its own evaporation and diffusion rate. update()
+    evaporates and diffuses every channel in a single pass over row bands
+    of tile_size, so a memory-mapped field is streamed through once.
+    
+    The dtype of data sets the precision. Floating types store levels
+    directly: float32 and float16 round each update to a relative error of
+    2**-24 and 2**-11, and float16 levels below about 1e-6 stop decaying.
+    uint16 data is fixed point, with levels stored as multiples of
+    scale = 1 / FIXED_ONE. Evaporation is an integer multiply that rounds
+    down, so levels always fade to zero. Each update rounds off less than
+    one step, so the accumulated error stays below scale / evaporation_rate
+    (3e-4 at the default rate of 0.05). Readers
+    compare raw values against encode(level) and turn them back into
+    levels with decode.
+    """
+    def __init__(self, data, evaporation_rate, diffusion_rate, tile_size=64):
+        self.data = data
+        self.channels, self.height, self.width = data.shape
+        self.evaporation_rate = np.broadcast_to(np.asarray(evaporation_rate, dtype=float),
+                                                (self.channels,)).copy()
+        self.diffusion_rate = np.broadcast_to(np.asarray(diffusion_rate, dtype=float),
+                                              (self.channels,)).copy()
+        self.tile_size = tile_size
+        self.fixed = data.dtype == np.uint16
+        self.scale = 1 / FIXED_ONE if self.fixed else 1.0
+    
+    def __getitem__(self, channel):
+        return self.data[channel]
+    
+    def encode(self, levels):
+        """Levels in storage units"""
+        if self.fixed:
+            return np.rint(np.asarray(levels, dtype=float) * FIXED_ONE)
+        return levels
+    
+    def decode(self, values):
+        """Stored values as float levels"""
+        return np.asarray(values, dtype=float) * self.scale
+    
+    def _evaporated(self, values, keep):
+        # values scaled by the per-channel factor keep, in storage units
+        if self.fixed:
+            # Fixed point multiplies by keep in units of 2**-16
+            keep_fixed = np.floor(keep * 2 ** 16).astype(np.uint32)
+            return values.astype(np.uint32) * keep_fixed[:, None, None] >> 16
+        return values * keep[:, None, None]
+    
+    def update(self, evaporation_ticks=1, diffusion_ticks=1):
+        """Evaporate, then blend each cell with the mean of its in-bounds neighbors
+        
+        Either process can cover several ticks at once, or none. Evaporation
+        compounds to (1 - rate)**ticks, and so does the weight each cell
+        keeps of itself: several diffusion ticks blend once at
+        1 - (1 - rate)**ticks.
+        """
+        keep = (1 - self.evaporation_rate) ** evaporation_ticks
+        spread = self.diffusion_rate * diffusion_ticks
+        if diffusion_ticks > 1:
+            spread = 1 - (1 - self.diffusion_rate) ** diffusion_ticks
+        if not spread.any():
+            if evaporation_ticks:
+                self.data[:] = self._evaporated(self.data, keep)
+            return
+        self._diffuse(spread, keep)
+    
+    def _diffuse(self, rate, keep):
+        rate = rate[:, None, None]
+        # Rows above each band are kept from before the update so results
+        # match a whole-grid pass; both steps are linear, so evaporation is
+        # folded into the final write
+        above = None
+        for y0 in range(0, self.height, self.tile_size):
+            y1 = min(self.height, y0 + self.tile_size)
+            rows = y1 - y0
+            band = np.array(self.data[:, y0:y1], dtype=float)
+            below = np.array(self.data[:, y1]) if y1 < self.height else None
+            
+            # Zero-padded band with one halo row/column on every side
+            padded = np.zeros((self.channels, rows + 2, self.width + 2))
+            valid = np.zeros((rows + 2, self.width + 2))
+            padded[:, 1:-1, 1:-1] = band
+            valid[1:-1, 1:-1] = 1
+            if above is not None:
+                padded[:, 0, 1:-1] = above
+                valid[0, 1:-1] = 1
+            if below is not None:
+                padded[:, -1, 1:-1] = below
+                valid[-1, 1:-1] = 1
+            
+            neighbor_sum = -band
+            neighbor_count = -valid[1:-1, 1:-1]
+            for dy in range(3):
+                for dx in range(3):
+                    neighbor_sum = neighbor_sum + padded[:, dy:dy + rows, dx:dx + self.width]
+                    neighbor_count = neighbor_count + valid[dy:dy + rows, dx:dx + self.width]
+            
+            above = band[:, -1].copy()
+            blended = (1 - rate) * band + rate * neighbor_sum / neighbor_count
+            if self.fixed:
+                blended = np.rint(blended)
+            self.data[:, y0:y1] = self._evaporated(blended, keep)
+
+def nest_flow_field(height, width, nest):
+    """Next (row, column) toward nest from every cell, as a (height, width, 2) array
+    
+    Each cell steps to its neighbor nearest the nest, ties going to the
+    first neighbor in get_neighbors order.
+    """
+    rows, cols = np.mgrid[0:height, 0:width]
+    best = np.full((height, width), np.inf)
+    field = np.zeros((height, width, 2), dtype=np.int32)
+    for dy, dx in NEIGHBOR_OFFSETS:
+        ny, nx = rows + dy, cols + dx
+        distance = np.sqrt((ny - nest[0])**2 + (nx - nest[1])**2)
+        distance[(ny < 0) | (ny >= height) | (nx < 0) | (nx >= width)] = np.inf
+        closer = distance < best
+        best[closer] = distance[closer]
+        field[closer] = np.stack([ny[closer], nx[closer]], axis=-1)
+    return field
+
+class TickScheduler:
+    """Tracks how many ticks each subsystem is behind
+    
+    Every tick() adds one pending tick to each subsystem; due(name) hands
+    back and clears the pending count once it reaches the subsystem's
+    period (or whenever there is any, with force=True), otherwise 0. The
+    caller then advances that subsystem by the returned number of ticks.
+    """
+    def __init__(self, periods):
+        self.periods = {}
+        self.pending = {}
+        for name, period in periods.items():
+            self.set_period(name, period)
+    
+    def set_period(self, name, period):
+        if period < 1:
+            raise ValueError(f"period of {name!r} must be at least 1, got {period}")
+        self.periods[name] = period
+        self.pending.setdefault(name, 0)
+    
+    def tick(self):
+        for name in self.pending:
+            self.pending[name] += 1
+    
+    def due(self, name, force=False):
+        ticks = self.pending[name]
+        if ticks and (force or ticks >= self.periods[name]):
+            self.pending[name] = 0
+            return ticks
+        return 0
+
+def choose(mask, rng):
+    """Index of a uniformly random True entry in each row of mask (rows need at least one)"""
+    k = (rng.random(len(mask)) * mask.sum(axis=1)).astype(int)
+    return (np.cumsum(mask, axis=1) > k[:, None]).argmax(axis=1)
+
+def lattice_step(pheromones, food, nests, flow_fields, ants, rng, scale=1.0):
+    """Apply move_ant to every ant of a batch of K colonies at once
+    
+    pheromones is (K, 2 * n_colonies, height, width) and food is
+    (K, height, width) units per cell; both are only read here except for
+    food pickups. ants holds arrays 'pos' and 'direction' (K, N, 2),
+    'has_food' and 'state' (K, N) and 'colony' (N,), updated in place;
+    state indexes STATES. Ants pick up food in index order, so a cell
+    never gives out more than it holds. Returns the food delivered as a
+    (K, n_colonies) array and this step's deposits as (channel, row, col,
+    amount) arrays, where channel indexes the flattened first two axes.
+    Pheromone values are levels times 1 / scale (see PheromoneField.scale);
+    deposit amounts are levels.
+    """
+    n_members, n_channels, height, width = pheromones.shape
+    n_colonies = n_channels // 2
+    pos = ants['pos'].reshape(-1, 2)
+    direction = ants['direction'].reshape(-1, 2)
+    has_food = ants['has_food'].reshape(-1)
+    state = ants['state'].reshape(-1)
+    n_ants = ants['pos'].shape[1]
+    member = np.repeat(np.arange(n_members), n_ants)
+    colony = np.tile(ants['colony'], n_members)
+    y, x = pos[:, 0], pos[:, 1]
+    
+    # If at nest and has food, drop it
+    nests = np.asarray(nests)
+    dropped = has_food & (y == nests[colony, 0]) & (x == nests[colony, 1])
+    has_food[dropped] = False
+    state[dropped] = 0
+    delivered = np.bincount(member[dropped] * n_colonies + colony[dropped],
+                            minlength=n_members * n_colonies).reshape(n_members, n_colonies)
+    
+    # If at food and doesn't have food, pick it up while the cell has any left
+    cell = (member * height + y) * width + x
+    flat_food = food.reshape(-1)
+    hungry = np.flatnonzero(~has_food & ~dropped & (flat_food[cell] > 0))
+    order = hungry[np.argsort(cell[hungry], kind='stable')]
+    cells, first, counts = np.unique(cell[order], return_index=True, return_counts=True)
+    rank = np.arange(len(order)) - np.repeat(first, counts)
+    picked = order[rank < flat_food[cell[order]]]
+    np.subtract.at(flat_food, cell[picked], 1)
+    has_food[picked] = True
+    state[picked] = 1
+    
+    # Neighbors in get_neighbors order; off-grid ones are masked out
+    ny = y[:, None] + NEIGHBOR_OFFSETS[:, 0]
+    nx = x[:, None] + NEIGHBOR_OFFSETS[:, 1]
+    valid = (ny >= 0) & (ny < height) & (nx >= 0) & (nx < width)
+    cy, cx = np.clip(ny, 0, height - 1), np.clip(nx, 0, width - 1)
+    next_y, next_x = y.copy(), x.copy()
+    
+    def levels(ids, channel):
+        level = pheromones[member[ids, None], channel[:, None], cy[ids], cx[ids]] * scale
+        return np.where(valid[ids], level, -np.inf)
+    
+    def strongest(level):
+        # max() over (level, (row, col)) tuples: ties go to the last neighbor
+        return 7 - level[:, ::-1].argmax(axis=1)
+    
+    def go(ids, neighbor):
+        next_y[ids] = ny[ids, neighbor]
+        next_x[ids] = nx[ids, neighbor]
+    
+    # Returning ants mark the food trail and follow the home trail or the flow field
+    returning = np.flatnonzero(has_food)
+    home = levels(returning, 2 * colony[returning])
+    follow = (home > 0.2).any(axis=1) & (rng.random(len(returning)) < 0.8)
+    go(returning[follow], strongest(home[follow]))
+    state[returning[follow]] = 3
+    homing = returning[~follow]
+    step = flow_fields[colony[homing], y[homing], x[homing]]
+    next_y[homing], next_x[homing] = step[:, 0], step[:, 1]
+    state[homing] = 1
+    
+    # Searching ants mark the home trail, take food next to them, follow the
+    # food trail or wander with momentum
+    searching = searchers = np.flatnonzero(~has_food)
+    food_near = valid[searching] & (food[member[searching, None], cy[searching], cx[searching]] > 0)
+    near = food_near.any(axis=1)
+    go(searching[near], choose(food_near[near], rng))
+    searching = searching[~near]
+    trail = levels(searching, 2 * colony[searching] + 1)
+    follow = (trail > 0.1).any(axis=1) & (rng.random(len(searching)) < 0.7)
+    go(searching[follow], strongest(trail[follow]))
+    state[searching[follow]] = 2
+    wandering = searching[~follow]
+    ahead_y = y[wandering] + direction[wandering, 0]
+    ahead_x = x[wandering] + direction[wandering, 1]
+    onward = ((rng.random(len(wandering)) < 0.7) & (ahead_y >= 0) & (ahead_y < height) &
+              (ahead_x >= 0) & (ahead_x < width))
+    next_y[wandering[onward]] = ahead_y[onward]
+    next_x[wandering[onward]] = ahead_x[onward]
+    turning = wandering[~onward]
+    go(turning, choose(valid[turning], rng))
+    state[wandering] = 0
+    
+    # Pheromone drops at the cells the ants are leaving
+    carrying = np.concatenate([picked, returning])
+    ids = np.concatenate([carrying, searchers])
+    trail = np.concatenate([np.ones(len(carrying), dtype=int), np.zeros(len(searchers), dtype=int)])
+    amounts = np.concatenate([np.ones(len(picked)), np.full(len(returning) + len(searchers), 0.5)])
+    deposits = (member[ids] * n_channels + 2 * colony[ids] + trail, y[ids], x[ids], amounts)
+    
+    direction[:, 0] = next_y - y
+    direction[:, 1] = next_x - x
+    pos[:, 0] = next_y
+    pos[:, 1] = next_x
+    return delivered, deposits
+
+class AntEnsemble:
+    """K independent copies of one AntSimulation configuration stepped together
+    
+    Every grid and ant array has a leading member axis, and each step runs
+    lattice_step over all members at once, so Python overhead is paid once
+    per step rather than once per member. Members differ only in their
+    random food placement and choices.
+    """
+    def __init__(self, n_members, width=100, height=100, n_ants=50, n_food_sources=5,
+                 evaporation_rate=0.05, diffusion_rate=0.1, food_amount=100,
+                 tile_size=64, n_colonies=1, seed=None, pheromone_precision='float64'):
+        self.n_members = n_members
+        self.width = width
+        self.height = height
+        self.n_ants = n_ants
+        self.n_food_sources = n_food_sources
+        self.food_amount = food_amount
+        self.n_colonies = n_colonies
+        self.rng = np.random.default_rng(seed)
+        
+        # One PheromoneField over all members' channels, seen as (K, 2C, H, W)
+        self.pheromone_data = np.zeros((n_members, 2 * n_colonies, height, width),
+                                       dtype=pheromone_dtype(pheromone_precision))
+        rates = lambda rate: np.tile(np.broadcast_to(np.asarray(rate, dtype=float), (2 * n_colonies,)),
+                                     n_members)
+        self.pheromones = PheromoneField(self.pheromone_data.reshape(-1, height, width),
+                                         rates(evaporation_rate), rates(diffusion_rate), tile_size)
+        
+        # Same nests as AntSimulation
+        if n_colonies == 1:
+            self.nests = [(height // 2, width // 2)]
+        else:
+            radius = min(width, height) * 0.3
+            angles = np.linspace(0, 2 * np.pi, n_colonies, endpoint=False)
+            self.nests = [(int(height // 2 + radius * np.sin(a)), int(width // 2 + radius * np.cos(a)))
+                          for a in angles]
+        self.flow_fields = np.stack([nest_flow_field(height, width, nest) for nest in self.nests])
+        
+        self.food = np.zeros((n_members, height, width), dtype=food_dtype(food_amount))
+        for member in range(n_members):
+            self.place_food_sources(member)
+        
+        # n_ants ants per colony, all starting at their nest
+        total = n_ants * n_colonies
+        colony = np.arange(total) // n_ants
+        self.ants = {
+            'colony': colony,
+            'pos': np.broadcast_to(np.asarray(self.nests)[colony], (n_members, total, 2)).copy(),
+            'has_food': np.zeros((n_members, total), dtype=bool),
+            'direction': NEIGHBOR_OFFSETS[self.rng.integers(8, size=(n_members, total))],
+            'state': np.zeros((n_members, total), dtype=np.int8)
+        }
+        
+        # Statistics per member
+        self.food_collected = np.zeros(n_members, dtype=int)
+        self.colony_food = np.zeros((n_members, n_colonies), dtype=int)
+        self.steps = 0
+    
+    def place_food_sources(self, member):
+        """Scatter one member's food clusters the way AntSimulation.place_food_sources does"""
+        food = self.food[member]
+        min_distance = min(self.width, self.height) * 0.2
+        for _ in range(self.n_food_sources):
+            while True:
+                y, x = self.rng.integers(self.height), self.rng.integers(self.width)
+                if (min(np.hypot(y - ny, x - nx) for ny, nx in self.nests) > min_distance
+                        and food[y, x] == 0):
+                    break
+            rows = slice(max(0, y - 2), y + 3)
+            cols = slice(max(0, x - 2), x + 3)
+            cluster = self.rng.random(food[rows, cols].shape) < 0.7  # 70% of cells get food
+            food[rows, cols][cluster] = self.food_amount
+    
+    def step(self):
+        """Advance every member by one time step and return per-member statistics"""
+        delivered, (channels, rows, cols, amounts) = lattice_step(
+            self.pheromone_data, self.food, self.nests, self.flow_fields, self.ants, self.rng,
+            self.pheromones.scale)
+        scatter_deposit(self.pheromone_data.reshape(-1, self.width), channels * self.height + rows,
+                        cols, self.pheromones.encode(amounts), mode='max')
+        self.pheromones.update()
+        
+        self.food_collected += delivered.sum(axis=1)
+        self.colony_food += delivered
+        self.steps += 1
+        return {
+            'food_collected': self.food_collected.copy(),
+            'colony_food': self.colony_food.copy(),
+            'steps': self.steps
+        }
+    
+    def run(self, n_steps=100):
+        """Run every member for n steps"""
+        return [self.step() for _ in range(n_steps)]
+
 class AntSimulation:
     def __init__(self, width=100, height=100, n_ants=50, n_food_sources=5, 
-                 evaporation_rate=0.05, diffusion_rate=0.1, food_amount=100):
+                 evaporation_rate=0.05, diffusion_rate=0.1, food_amount=100,
+                 storage_dir=None, tile_size=64, n_colonies=1, vectorized=False,
+                 pheromone_precision='float64', schedule=None):
         # Environment setup
         self.width = width
         self.height = height
@@ -17,18 +466,53 @@ class AntSimulation:
         self.diffusion_rate = diffusion_rate
         self.food_amount = food_amount
         
-        # Initialize grids
-        self.grid = np.zeros((height, width), dtype=int)  # 0: empty, 1: nest, 2: food, 3: ant
-        self.pheromone_home = np.zeros((height, width))
-        self.pheromone_food = np.zeros((height, width))
-        self.food_grid = np.zeros((height, width), dtype=int)
+        # Grids live in RAM unless storage_dir is given, then in np.memmap files there
+        self.storage_dir = storage_dir
+        self.tile_size = tile_size
+        
+        # Vectorized simulations keep ants as arrays and move them all at once
+        # with lattice_step; its draws are seeded from the random module, so
+        # per-ant simulations leave the random stream untouched
+        self.vectorized = vectorized
+        self.rng = np.random.default_rng(random.getrandbits(64)) if vectorized else None
+        
+        # Initialize grids: NEST/FOOD/OBSTACLE bits, ants per cell and food
+        # units per cell; the legacy 0-3 code view is the grid property
+        self.flags = self.allocate('flags', np.uint8)
+        self.occupancy = self.allocate('occupancy', np.uint16)
+        self.food_grid = self.allocate('food_grid', food_dtype(food_amount))
+        
+        # Every colony owns a home and a food trail channel: 2 * colony and
+        # 2 * colony + 1; evaporation/diffusion rates may be per channel
+        self.n_colonies = n_colonies
+        # Pheromone levels are stored at pheromone_precision: 'float64',
+        # 'float32', 'float16' or 'fixed16' (see PheromoneField)
+        self.pheromones = PheromoneField(self.allocate('pheromones', pheromone_dtype(pheromone_precision),
+                                                       (2 * n_colonies, height, width)),
+                                         evaporation_rate, diffusion_rate, tile_size)
+        self.pheromone_home = self.pheromones[0]
+        self.pheromone_food = self.pheromones[1]
         
         # Initialize ants
-        self.ants = []
+        self._ants = []
+        self.ant_arrays = None
+        # Pheromone drops are queued during a step and scattered in one go
+        self.deposits = []
         
-        # Initialize nest position (center of grid)
-        self.nest_pos = (height // 2, width // 2)
-        self.grid[self.nest_pos] = 1
+        # Initialize nest positions: the center for a single colony, otherwise
+        # evenly spaced on a ring around it
+        if n_colonies == 1:
+            self.nests = [(height // 2, width // 2)]
+        else:
+            radius = min(width, height) * 0.3
+            angles = np.linspace(0, 2 * np.pi, n_colonies, endpoint=False)
+            self.nests = [(int(height // 2 + radius * np.sin(a)), int(width // 2 + radius * np.cos(a)))
+                          for a in angles]
+        self.nest_pos = self.nests[0]
+        for nest in self.nests:
+            self.flags[nest] |= NEST
+        # Returning ants read their next cell from their nest's flow field
+        self.flow_fields = np.stack([nest_flow_field(height, width, nest) for nest in self.nests])
         
         # Place food sources
         self.place_food_sources()
@@ -36,9 +520,75 @@ class AntSimulation:
         # Create ants
         self.create_ants()
         
+        self.update_occupancy()
+        
         # Statistics
         self.food_collected = 0
+        self.colony_food = [0] * n_colonies
         self.steps = 0
+        
+        # Subsystems run every period ticks from SCHEDULE, overridden by
+        # schedule, and catch up on the ticks they skipped when they do
+        self.scheduler = TickScheduler({**SCHEDULE, **(schedule or {})})
+    
+    def allocate(self, name, dtype=float, shape=None):
+        """Create a zeroed grid, (height, width) by default, memory-mapped if storage_dir is set"""
+        shape = shape or (self.height, self.width)
+        if self.storage_dir is None:
+            return np.zeros(shape, dtype=dtype)
+        os.makedirs(self.storage_dir, exist_ok=True)
+        return np.memmap(os.path.join(self.storage_dir, f'{name}.dat'), dtype=dtype,
+                         mode='w+', shape=shape)
+    
+    @property
+    def grid(self):
+        """Cell codes 0: empty, 1: nest, 2: food, 3: ant; ants never hide the nest or food"""
+        if self.scheduler.due('occupancy', force=True):
+            self.update_occupancy()
+        codes = np.where(self.occupancy > 0, 3, 0).astype(np.uint8)
+        codes[self.flags & FOOD > 0] = 2
+        codes[self.flags & NEST > 0] = 1
+        return codes
+    
+    @property
+    def ants(self):
+        """Ant dicts; for vectorized simulations a snapshot built from the arrays"""
+        if self.ant_arrays is None:
+            return self._ants
+        arrays = self.ant_arrays
+        return [{'id': i,
+                 'colony': int(colony),
+                 'pos': (int(pos[0]), int(pos[1])),
+                 'has_food': bool(has_food),
+                 'direction': (int(direction[0]), int(direction[1])),
+                 'state': STATES[state]}
+                for i, (colony, pos, has_food, direction, state) in enumerate(zip(
+                    arrays['colony'], arrays['pos'][0], arrays['has_food'][0],
+                    arrays['direction'][0], arrays['state'][0]))]
+    
+    def ant_positions(self):
+        """(N, 2) array of ant (row, column) positions"""
+        if self.ant_arrays is not None:
+            return self.ant_arrays['pos'][0]
+        return np.array([ant['pos'] for ant in self._ants], dtype=int).reshape(-1, 2)
+    
+    def update_occupancy(self):
+        """Recount ants per cell in one bincount"""
+        rows, cols = self.ant_positions().T
+        self.occupancy[:] = np.bincount(rows * self.width + cols,
+                                        minlength=self.height * self.width).reshape(self.height, self.width)
+    
+    def active_tiles(self):
+        """Tiles holding ants plus their 8 neighbors, i.e. everything touched next step"""
+        n_ty = (self.height - 1) // self.tile_size + 1
+        n_tx = (self.width - 1) // self.tile_size + 1
+        tiles = set()
+        for ty, tx in set(map(tuple, (self.ant_positions() // self.tile_size).tolist())):
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    if 0 <= ty + dy < n_ty and 0 <= tx + dx < n_tx:
+                        tiles.add((ty + dy, tx + dx))
+        return sorted(tiles)
     
     def place_food_sources(self):
         """Place food sources randomly on the grid"""
@@ -49,7 +599,8 @@ class AntSimulation:
                 y = random.randint(0, self.height - 1)
                 # Make sure it's at least 20% of grid size away from nest
                 min_distance = min(self.width, self.height) * 0.2
-                if self.distance((y, x), self.nest_pos) > min_distance and self.grid[y, x] == 0:
+                if (min(self.distance((y, x), nest) for nest in self.nests) > min_distance
+                        and self.flags[y, x] == 0):
                     break
             
             # Create a small cluster of food
@@ -58,20 +609,32 @@ class AntSimulation:
                     ny, nx = y + i, x + j
                     if 0 <= ny < self.height and 0 <= nx < self.width:
                         if random.random() < 0.7:  # 70% chance to place food in this cell
-                            self.grid[ny, nx] = 2
+                            self.flags[ny, nx] |= FOOD
                             self.food_grid[ny, nx] = self.food_amount
     
     def create_ants(self):
-        """Create ants at the nest position"""
-        for i in range(self.n_ants):
-            self.ants.append({
+        """Create n_ants ants at each colony's nest"""
+        for i in range(self.n_ants * self.n_colonies):
+            colony = i // self.n_ants
+            self._ants.append({
                 'id': i,
-                'pos': self.nest_pos,
+                'colony': colony,
+                'pos': self.nests[colony],
                 'has_food': False,
                 'direction': random.choice([(0, 1), (1, 0), (0, -1), (-1, 0),
                                           (1, 1), (1, -1), (-1, 1), (-1, -1)]),
                 'state': 'exploring'  # exploring, returning, following_food, following_home
             })
+        if self.vectorized:
+            # One member of the (K, N) layout lattice_step works on
+            self.ant_arrays = {
+                'colony': np.array([ant['colony'] for ant in self._ants], dtype=int),
+                'pos': np.array([[ant['pos'] for ant in self._ants]], dtype=int).reshape(1, -1, 2),
+                'has_food': np.zeros((1, len(self._ants)), dtype=bool),
+                'direction': np.array([[ant['direction'] for ant in self._ants]], dtype=int).reshape(1, -1, 2),
+                'state': np.zeros((1, len(self._ants)), dtype=np.int8)
+            }
+            self._ants = []
     
     def distance(self, pos1, pos2):
         """Calculate Euclidean distance between two positions"""
@@ -89,86 +652,69 @@ class AntSimulation:
                     neighbors.append((ny, nx))
         return neighbors
     
-    def update_pheromones(self):
-        """Update pheromone levels - evaporation and diffusion"""
-        # Evaporation
-        self.pheromone_food *= (1 - self.evaporation_rate)
-        self.pheromone_home *= (1 - self.evaporation_rate)
-        
-        # Diffusion - simple average with neighbors
-        if self.diffusion_rate > 0:
-            pheromone_food_new = self.pheromone_food.copy()
-            pheromone_home_new = self.pheromone_home.copy()
-            
-            for y in range(self.height):
-                for x in range(self.width):
-                    neighbors = self.get_neighbors((y, x))
-                    if neighbors:
-                        # Food pheromone diffusion
-                        neighbor_sum = sum(self.pheromone_food[ny, nx] for ny, nx in neighbors)
-                        avg = neighbor_sum / len(neighbors)
-                        pheromone_food_new[y, x] = (1 - self.diffusion_rate) * self.pheromone_food[y, x] + self.diffusion_rate * avg
-                        
-                        # Home pheromone diffusion
-                        neighbor_sum = sum(self.pheromone_home[ny, nx] for ny, nx in neighbors)
-                        avg = neighbor_sum / len(neighbors)
-                        pheromone_home_new[y, x] = (1 - self.diffusion_rate) * self.pheromone_home[y, x] + self.diffusion_rate * avg
-            
-            self.pheromone_food = pheromone_food_new
-            self.pheromone_home = pheromone_home_new
+    def update_pheromones(self, evaporation_ticks=1, diffusion_ticks=1):
+        """Update pheromone levels - evaporation and diffusion of all channels in one pass"""
+        self.pheromones.update(evaporation_ticks, diffusion_ticks)
     
     def move_ant(self, ant):
         """Move a single ant based on its state and surroundings"""
         y, x = ant['pos']
         neighbors = self.get_neighbors((y, x))
+        colony = ant['colony']
+        nest_pos = self.nests[colony]
+        pheromone_home = self.pheromones[2 * colony]
+        pheromone_food = self.pheromones[2 * colony + 1]
         
         # If at nest and has food, drop it
-        if ant['pos'] == self.nest_pos and ant['has_food']:
+        if ant['pos'] == nest_pos and ant['has_food']:
             ant['has_food'] = False
             self.food_collected += 1
+            self.colony_food[colony] += 1
             ant['state'] = 'exploring'
         
         # If at food source and doesn't have food, pick it up
-        elif self.grid[y, x] == 2 and not ant['has_food'] and self.food_grid[y, x] > 0:
+        elif self.flags[y, x] & FOOD and not ant['has_food'] and self.food_grid[y, x] > 0:
             ant['has_food'] = True
             self.food_grid[y, x] -= 1
             if self.food_grid[y, x] <= 0:
-                self.grid[y, x] = 0  # Remove food source when depleted
+                self.flags[y, x] ^= FOOD  # Remove food source when depleted
             ant['state'] = 'returning'
             # Drop food pheromone when finding food
-            self.pheromone_food[y, x] = 1.0
+            self.deposits.append((2 * colony + 1, y, x, 1.0))
         
         # Decide next direction based on state
         next_pos = None
         if ant['has_food']:  # Returning to nest
             # Drop food pheromone
-            self.pheromone_food[y, x] = max(self.pheromone_food[y, x], 0.5)
+            self.deposits.append((2 * colony + 1, y, x, 0.5))
             
             # First priority: follow home pheromone if strong enough
-            home_pheromones = [(self.pheromone_home[ny, nx], (ny, nx)) for ny, nx in neighbors]
-            strong_pheromones = [pos for level, pos in home_pheromones if level > 0.2]
+            home_pheromones = [(pheromone_home[ny, nx], (ny, nx)) for ny, nx in neighbors]
+            threshold = self.pheromones.encode(0.2)
+            strong_pheromones = [pos for level, pos in home_pheromones if level > threshold]
             
             if strong_pheromones and random.random() < 0.8:  # 80% chance to follow pheromone
                 next_pos = max(home_pheromones)[1]
                 ant['state'] = 'following_home'
             else:
                 # Otherwise, try to move towards nest
-                distances = [(self.distance((ny, nx), self.nest_pos), (ny, nx)) for ny, nx in neighbors]
-                next_pos = min(distances)[1]
+                ny, nx = self.flow_fields[colony][y, x]
+                next_pos = (int(ny), int(nx))
                 ant['state'] = 'returning'
         
         else:  # Looking for food
             # Drop home pheromone
-            self.pheromone_home[y, x] = max(self.pheromone_home[y, x], 0.5)
+            self.deposits.append((2 * colony, y, x, 0.5))
             
             # First check for food in neighbors
-            food_neighbors = [(ny, nx) for ny, nx in neighbors if self.grid[ny, nx] == 2]
+            food_neighbors = [(ny, nx) for ny, nx in neighbors if self.flags[ny, nx] & FOOD]
             if food_neighbors:
                 next_pos = random.choice(food_neighbors)
             else:
                 # Follow food pheromone if strong enough
-                food_pheromones = [(self.pheromone_food[ny, nx], (ny, nx)) for ny, nx in neighbors]
-                strong_pheromones = [pos for level, pos in food_pheromones if level > 0.1]
+                food_pheromones = [(pheromone_food[ny, nx], (ny, nx)) for ny, nx in neighbors]
+                threshold = self.pheromones.encode(0.1)
+                strong_pheromones = [pos for level, pos in food_pheromones if level > threshold]
                 
                 if strong_pheromones and random.random() < 0.7:  # 70% chance to follow pheromone
                     next_pos = max(food_pheromones)[1]
@@ -197,61 +743,94 @@ class AntSimulation:
             # Update direction for momentum
             ant['direction'] = (next_pos[0] - y, next_pos[1] - x)
     
+    def move_ants(self):
+        """move_ant for the whole population at once, deposits included"""
+        delivered, (channels, rows, cols, amounts) = lattice_step(
+            self.pheromones.data[None], self.food_grid[None], self.nests, self.flow_fields,
+            self.ant_arrays, self.rng, self.pheromones.scale)
+        scatter_deposit(self.pheromones.data.reshape(-1, self.width), channels * self.height + rows,
+                        cols, self.pheromones.encode(amounts), mode='max')
+        # Remove food sources that were picked clean
+        self.flags[(self.flags & FOOD > 0) & (self.food_grid == 0)] ^= FOOD
+        self.food_collected += int(delivered.sum())
+        for colony, count in enumerate(delivered[0]):
+            self.colony_food[colony] += int(count)
+    
+    def flush_deposits(self):
+        """Apply this step's pheromone drops with one scatter per channel"""
+        if not self.deposits:
+            return
+        channels, rows, cols, amounts = (np.array(column) for column in zip(*self.deposits))
+        for channel in np.unique(channels):
+            mine = channels == channel
+            scatter_deposit(self.pheromones[channel], rows[mine], cols[mine],
+                            self.pheromones.encode(amounts[mine]), mode='max')
+        self.deposits.clear()
+    
     def step(self):
         """Advance the simulation by one time step"""
-        # Clear ants from grid for visualization
-        ant_positions = []
-        for ant in self.ants:
-            if self.grid[ant['pos']] == 3:  # Only clear if it's an ant (not nest or food)
-                self.grid[ant['pos']] = 0
-            ant_positions.append(ant['pos'])
-        
-        # Move each ant
-        for ant in self.ants:
-            self.move_ant(ant)
-        
-        # Update pheromones
-        self.update_pheromones()
-        
-        # Update ants on grid for visualization
-        for ant in self.ants:
-            if self.grid[ant['pos']] == 0:  # Only place ant if cell is empty
-                self.grid[ant['pos']] = 3
+        # Move each ant; out-of-core grids get the pages around the population
+        # prefetched. Ants keep their order, since it decides who draws which
+        # random numbers, so results match the in-RAM grids
+        if self.storage_dir is not None:
+            tiles = self.active_tiles()
+            for grid in (self.pheromones.data, self.food_grid, self.flags):
+                prefetch_tiles(grid, tiles, self.tile_size)
+        if self.vectorized:
+            self.move_ants()
+        else:
+            for ant in self._ants:
+                self.move_ant(ant)
+            self.flush_deposits()
         
+        # Update pheromones and occupancy when their periods come round
+        self.scheduler.tick()
+        evaporation_ticks = self.scheduler.due('evaporate')
+        diffusion_ticks = self.scheduler.due('diffuse')
+        if evaporation_ticks or diffusion_ticks:
+            self.update_pheromones(evaporation_ticks, diffusion_ticks)
+        if self.scheduler.due('occupancy'):
+            self.update_occupancy()
         self.steps += 1
         
         # Return statistics
         return {
             'food_collected': self.food_collected,
+            'colony_food': list(self.colony_food),
             'steps': self.steps
         }
     
     def run(self, n_steps=100):
-        """Run the simulation for n steps"""
+        """Run the simulation for n steps, keeping statistics every 'statistics' period"""
         stats = []
         for _ in range(n_steps):
             stat = self.step()
-            stats.append(stat)
+            if self.scheduler.due('statistics'):
+                stats.append(stat)
         return stats
     
     def visualize(self, ax=None):
         """Visualize the current state of the simulation"""
+        # Plotting libraries load on first use so the simulation imports quickly
+        from matplotlib.colors import ListedColormap
         if ax is None:
+            import matplotlib.pyplot as plt
             fig, ax = plt.subplots(figsize=(10, 10))
         
         # Create a visualization grid
         vis_grid = self.grid.copy()
         
         # Create a custom colormap
-        colors = ['white', 'brown', 'green', 'black']  # empty, nest, food, ant
-        cmap = ListedColormap(colors)
+        cmap = ListedColormap(GRID_COLORS)
         
         # Plot the grid
         ax.imshow(vis_grid, cmap=cmap, vmin=0, vmax=3)
         
-        # Plot pheromones as transparent overlays
-        food_pheromone = np.ma.masked_where(self.pheromone_food < 0.05, self.pheromone_food)
-        home_pheromone = np.ma.masked_where(self.pheromone_home < 0.05, self.pheromone_home)
+        # Plot pheromones as transparent overlays, summed over colonies
+        all_food = self.pheromones.decode(self.pheromones.data[1::2]).sum(axis=0)
+        all_home = self.pheromones.decode(self.pheromones.data[0::2]).sum(axis=0)
+        food_pheromone = np.ma.masked_where(all_food < 0.05, all_food)
+        home_pheromone = np.ma.masked_where(all_home < 0.05, all_home)
         
         ax.imshow(food_pheromone, cmap='Reds', alpha=0.5, vmin=0, vmax=1)
         ax.imshow(home_pheromone, cmap='Blues', alpha=0.5, vmin=0, vmax=1)
@@ -260,21 +839,234 @@ class AntSimulation:
         ax.axis('off')
         
         return ax
+    
+    def frame_image(self):
+        """The picture visualize draws, flattened into one RGB array"""
+        from matplotlib import colormaps
+        from matplotlib.colors import to_rgb
+        image = np.array([to_rgb(color) for color in GRID_COLORS])[self.grid]
+        # Blend the pheromone overlays in at 50% like the imshow layers
+        for channels, cmap in ((slice(1, None, 2), 'Reds'), (slice(0, None, 2), 'Blues')):
+            level = self.pheromones.decode(self.pheromones.data[channels]).sum(axis=0)
+            shown = level >= 0.05
+            image[shown] = 0.5 * image[shown] + 0.5 * colormaps[cmap](np.clip(level[shown], 0, 1))[:, :3]
+        return image
+
+def load_distance_matrix(path):
+    """Read a square distance matrix from a .npy file or a whitespace/comma separated text file
+    
+    Lines starting with # are skipped; inf, nan, zero or negative entries
+    off the diagonal mean there is no edge.
+    """
+    if path.endswith('.npy'):
+        distances = np.load(path)
+    else:
+        with open(path) as f:
+            distances = np.array([[float(value) for value in line.replace(',', ' ').split()]
+                                  for line in f if line.strip() and not line.startswith('#')])
+    if distances.ndim != 2 or distances.shape[0] != distances.shape[1]:
+        raise ValueError(f"distance matrix must be square, got shape {distances.shape}")
+    return distances
+
+class GraphColony:
+    """Ant colony optimization on a weighted graph given by a distance matrix
+    
+    The same reinforcement loop as AntSimulation: every iteration all ants
+    build a solution, pheromone evaporates everywhere and each ant deposits
+    deposit / length on the edges it used. Ants move together, one batched
+    draw per step over the pheromone**alpha * (1 / distance)**beta weights.
+    problem='tsp' builds closed tours over all nodes; problem='path' walks
+    from source to target without revisiting nodes.
+    """
+    def __init__(self, distances, n_ants=50, alpha=1.0, beta=2.0, evaporation_rate=0.1,
+                 deposit=1.0, problem='tsp', source=0, target=None, seed=None):
+        if problem not in ('tsp', 'path'):
+            raise ValueError(f"unknown problem {problem!r}")
+        if problem == 'path' and target is None:
+            raise ValueError("problem='path' needs a target node")
+        self.distances = np.asarray(distances, dtype=float)
+        self.n_nodes = len(self.distances)
+        self.n_ants = n_ants
+        self.alpha = alpha
+        self.beta = beta
+        self.evaporation_rate = evaporation_rate
+        self.deposit = deposit
+        self.problem = problem
+        self.source = source
+        self.target = target
+        self.rng = np.random.default_rng(seed)
+        
+        # Heuristic desirability 1 / distance, zero where there is no edge
+        self.edges = np.isfinite(self.distances) & (self.distances > 0)
+        np.fill_diagonal(self.edges, False)
+        self.heuristic = np.zeros_like(self.distances)
+        self.heuristic[self.edges] = 1 / self.distances[self.edges]
+        self.pheromone = np.where(self.edges, 1.0, 0.0)
+        
+        self.best_solution = None
+        self.best_length = np.inf
+        self.iterations = 0
+    
+    def sample(self, weights):
+        """Draw one column per row of weights with probability proportional to the weights"""
+        cumulative = np.cumsum(weights, axis=1)
+        threshold = self.rng.random(len(weights)) * cumulative[:, -1]
+        above = cumulative > threshold[:, None]
+        choice = above.argmax(axis=1)
+        # Rounding can leave the threshold at the total; take the last candidate then
+        missed = ~above[np.arange(len(weights)), choice]
+        if missed.any():
+            choice[missed] = weights.shape[1] - 1 - (weights[missed, ::-1] > 0).argmax(axis=1)
+        return choice
+    
+    def construct(self):
+        """Build one solution per ant; returns (n_ants, n_nodes + 1) node array padded with -1, and lengths"""
+        n, m = self.n_nodes, self.n_ants
+        attraction = self.pheromone ** self.alpha * self.heuristic ** self.beta
+        ants = np.arange(m)
+        solutions = np.full((m, n + 1), -1)
+        visited = np.zeros((m, n), dtype=bool)
+        if self.problem == 'tsp':
+            current = self.rng.integers(n, size=m)
+        else:
+            current = np.full(m, self.source)
+        solutions[:, 0] = current
+        visited[ants, current] = True
+        lengths = np.zeros(m)
+        active = np.ones(m, dtype=bool)
+        if self.problem == 'path':
+            active &= current != self.target
+        
+        for step in range(1, n):
+            if not active.any():
+                break
+            walkers = ants[active]
+            weights = attraction[current[walkers]] * ~visited[walkers]
+            # Pheromone can underflow to zero; fall back to any open edge
+            stuck = weights.sum(axis=1) <= 0
+            if stuck.any():
+                weights[stuck] = (self.edges[current[walkers[stuck]]] & ~visited[walkers[stuck]])
+            dead = weights.sum(axis=1) <= 0
+            # Ants with nowhere left to go have failed
+            lengths[walkers[dead]] = np.inf
+            active[walkers[dead]] = False
+            walkers, weights = walkers[~dead], weights[~dead]
+            
+            nodes = self.sample(weights)
+            lengths[walkers] += self.distances[current[walkers], nodes]
+            current[walkers] = nodes
+            solutions[walkers, step] = nodes
+            visited[walkers, nodes] = True
+            if self.problem == 'path':
+                active[walkers[nodes == self.target]] = False
+        
+        if self.problem == 'tsp':
+            # Close the tour back to its first node
+            closing = self.edges[current, solutions[:, 0]]
+            lengths[closing] += self.distances[current[closing], solutions[closing, 0]]
+            lengths[~closing] = np.inf
+            solutions[:, n] = np.where(closing, solutions[:, 0], -1)
+        else:
+            lengths[active] = np.inf  # Never reached the target
+        return solutions, lengths
+    
+    def update_pheromones(self, solutions, lengths):
+        """Evaporate everywhere, then deposit deposit / length along every finished solution in one scatter"""
+        self.pheromone *= 1 - self.evaporation_rate
+        finished = np.isfinite(lengths)
+        if not finished.any():
+            return
+        solutions = solutions[finished]
+        start, end = solutions[:, :-1], solutions[:, 1:]
+        used = (start >= 0) & (end >= 0)
+        amounts = np.broadcast_to((self.deposit / lengths[finished])[:, None], used.shape)[used]
+        flat = start[used] * self.n_nodes + end[used]
+        if self.problem == 'tsp':
+            # Tours are undirected: reinforce both directions of each edge
+            flat = np.concatenate([flat, end[used] * self.n_nodes + start[used]])
+            amounts = np.concatenate([amounts, amounts])
+        self.pheromone += np.bincount(flat, weights=amounts,
+                                      minlength=self.n_nodes ** 2).reshape(self.n_nodes, self.n_nodes)
+    
+    def step(self):
+        """Run one iteration and return its statistics"""
+        solutions, lengths = self.construct()
+        self.update_pheromones(solutions, lengths)
+        self.iterations += 1
+        best = int(np.argmin(lengths))
+        if lengths[best] < self.best_length:
+            self.best_length = float(lengths[best])
+            route = solutions[best]
+            self.best_solution = route[route >= 0].tolist()
+        return {
+            'iteration': self.iterations,
+            'iteration_best': float(lengths[best]),
+            'best_length': self.best_length,
+            'best_solution': self.best_solution
+        }
+    
+    def run(self, n_iterations=100, verbose=False):
+        """Run n iterations; returns the statistics of every iteration"""
+        stats = []
+        for _ in range(n_iterations):
+            stat = self.step()
+            stats.append(stat)
+            if verbose:
+                print(f"Iteration {stat['iteration']}: best this iteration {stat['iteration_best']:.2f}, "
+                      f"best so far {stat['best_length']:.2f}")
+        return stats
+
+def _run_graph_colony(args):
+    distances, n_iterations, params = args
+    return GraphColony(distances, **params).run(n_iterations)
+
+def solve_graph(distances, n_iterations=100, n_colonies=1, processes=None, seed=None, **params):
+    """Run n_colonies independent GraphColony instances and return the best solution
+    
+    distances is a matrix or a path for load_distance_matrix; other keyword
+    arguments go to GraphColony. With processes > 1 the colonies run in a
+    process pool. Returns (best_solution, best_length, stats per colony).
+    """
+    if isinstance(distances, str):
+        distances = load_distance_matrix(distances)
+    seeds = np.random.SeedSequence(seed).spawn(n_colonies)
+    jobs = [(distances, n_iterations, dict(params, seed=s)) for s in seeds]
+    if processes is not None and processes > 1 and n_colonies > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(_run_graph_colony, jobs))
+    else:
+        results = [_run_graph_colony(job) for job in jobs]
+    best = min(results, key=lambda stats: stats[-1]['best_length'])
+    return best[-1]['best_solution'], best[-1]['best_length'], results
 
 # Run the simulation
-def run_ant_simulation(width=80, height=80, n_ants=50, n_steps=200):
-    """Run the ant simulation and create an animation"""
+def run_ant_simulation(width=80, height=80, n_ants=50, n_steps=200, ticks_per_frame=1):
+    """Run the ant simulation and create an animation
+    
+    The artists are created once and refreshed with set_data under
+    blitting, so a frame uploads one image; each frame advances
+    ticks_per_frame simulation steps.
+    """
+    import matplotlib.pyplot as plt
+    import matplotlib.animation as animation
     simulation = AntSimulation(width=width, height=height, n_ants=n_ants)
     
     fig, ax = plt.subplots(figsize=(10, 10))
+    image = ax.imshow(simulation.frame_image())
+    # Blitting leaves the title alone, so the status lives inside the axes
+    status = ax.text(0.02, 0.98, '', transform=ax.transAxes, va='top',
+                     bbox=dict(facecolor='white', alpha=0.7))
+    ax.axis('off')
     
     def update(frame):
-        ax.clear()
-        simulation.step()
-        simulation.visualize(ax)
-        return ax,
+        for _ in range(ticks_per_frame):
+            simulation.step()
+        image.set_data(simulation.frame_image())
+        status.set_text(f'Step: {simulation.steps}, Food Collected: {simulation.food_collected}')
+        return image, status
     
-    ani = animation.FuncAnimation(fig, update, frames=n_steps, interval=100, blit=False)
+    ani = animation.FuncAnimation(fig, update, frames=n_steps // ticks_per_frame, interval=100, blit=True)
     plt.close()  # Prevent duplicate display in notebooks
     
     return simulation, ani
@@ -282,6 +1074,7 @@ def run_ant_simulation(width=80, height=80, n_ants=50, n_steps=200):
 # Use this to run the simulation without animation
 def run_and_plot(width=80, height=80, n_ants=50, n_steps=50, plot_interval=10):
     """Run the simulation and plot at specified intervals"""
+    import matplotlib.pyplot as plt
     simulation = AntSimulation(width=width, height=height, n_ants=n_ants)
     
     # Plot initial state
@@ -308,10 +1101,21 @@ def run_and_plot(width=80, height=80, n_ants=50, n_steps=50, plot_interval=10):
 
 # Example usage
 if __name__ == "__main__":
-    # For static snapshots
-    simulation = run_and_plot(width=50, height=50, n_ants=30, n_steps=100, plot_interval=25)
-    
-    # If you want animation, uncomment below (works better in Jupyter notebooks)
-    simulation, ani = run_ant_simulation(width=50, height=50, n_ants=30, n_steps=100)
-    from IPython.display import HTML
-    HTML(ani.to_jshtml())
\ No newline at end of file
+    import sys
+    if len(sys.argv) > 1:
+        # Graph solver: ant-colony3.7.py DISTANCES [tsp | path SOURCE TARGET]
+        problem = sys.argv[2] if len(sys.argv) > 2 else 'tsp'
+        params = {'problem': problem}
+        if problem == 'path':
+            params.update(source=int(sys.argv[3]), target=int(sys.argv[4]))
+        colony = GraphColony(load_distance_matrix(sys.argv[1]), **params)
+        colony.run(100, verbose=True)
+        print(f"Best solution ({colony.best_length:.2f}): {colony.best_solution}")
+    else:
+        # For static snapshots
+        simulation = run_and_plot(width=50, height=50, n_ants=30, n_steps=100, plot_interval=25)
+        
+        # If you want animation, uncomment below (works better in Jupyter notebooks)
+        simulation, ani = run_ant_simulation(width=50, height=50, n_ants=30, n_steps=100)
+        from IPython.display import HTML
+        HTML(ani.to_jshtml())
\ No newline at end of file
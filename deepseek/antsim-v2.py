@@ -33,26 +33,31 @@ FOOD_TO_SPAWN_ANT = 5  # Food units required to spawn a new ant
 PHEROMONE_STRENGTH = 200  # Increased from 100
 PHEROMONE_DECAY = 0.5     # Reduced from 1
 PHEROMONE_DROP_INTERVAL = 10
+TO_NEST, TO_FOOD = 0, 1  # Pheromone directions
 
 class Pheromone:
+    __slots__ = ('x', 'y', 'strength', 'direction')
+
     def __init__(self, x, y, strength, direction):
         self.x = x
         self.y = y
         self.strength = strength
-        self.direction = direction  # "to_nest" or "to_food"
+        self.direction = direction  # TO_NEST or TO_FOOD
 
     def decay(self):
         self.strength -= PHEROMONE_DECAY
         return self.strength > 0
 
     def draw(self, screen):
-        if self.direction == "to_nest":
-            color = (255, 255, 0, int(self.strength / PHEROMONE_STRENGTH * 255))  # Yellow for "to_nest"
+        if self.direction == TO_NEST:
+            color = (255, 255, 0, int(self.strength / PHEROMONE_STRENGTH * 255))  # Yellow for TO_NEST
         else:
-            color = (255, 165, 0, int(self.strength / PHEROMONE_STRENGTH * 255))  # Orange for "to_food"
+            color = (255, 165, 0, int(self.strength / PHEROMONE_STRENGTH * 255))  # Orange for TO_FOOD
         pygame.draw.circle(screen, color, (int(self.x), int(self.y)), 2)
 
 class Ant:
+    __slots__ = ('x', 'y', 'nest', 'angle', 'has_food', 'pheromone_timer')
+
     def __init__(self, x, y, nest):
         self.x = x
         self.y = y
@@ -104,7 +109,7 @@ class Ant:
         max_strength = 0
 
         for pheromone in pheromones:
-            if pheromone.direction != "to_food":  # Only follow "to_food" pheromones
+            if pheromone.direction != TO_FOOD:  # Only follow TO_FOOD pheromones
                 continue
             dx = pheromone.x - self.x
             dy = pheromone.y - self.y
@@ -139,7 +144,7 @@ class Ant:
 
     def drop_pheromone(self, pheromones):
         if self.has_food and self.pheromone_timer <= 0:
-            pheromones.append(Pheromone(self.x, self.y, PHEROMONE_STRENGTH, "to_nest"))
+            pheromones.append(Pheromone(self.x, self.y, PHEROMONE_STRENGTH, TO_NEST))
             self.pheromone_timer = PHEROMONE_DROP_INTERVAL
         else:
             self.pheromone_timer -= 1
@@ -149,6 +154,8 @@ class Ant:
         pygame.draw.circle(screen, color, (int(self.x), int(self.y)), ANT_SIZE)
 
 class Food:
+    __slots__ = ('x', 'y', 'amount')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -159,6 +166,8 @@ class Food:
             pygame.draw.circle(screen, GREEN, (int(self.x), int(self.y)), self.amount)
 
 class Nest:
+    __slots__ = ('x', 'y', 'food_deposited', 'total_food_collected', 'total_ants_spawned')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -1,6 +1,7 @@
 import pygame
 import random
 import math
+import numpy as np
 from collections import deque
 
 # Constants
@@ -22,43 +23,63 @@ BUTTON_TEXT_COLOR = (255, 255, 255)  # White text for buttons
 ANT_SIZE = 5
 ANT_SPEED = 2  # Initial ant speed
 SENSE_RANGE = 100  # Increased sensing range
+ANT_POOL_CAPACITY = 64  # Ant slots allocated up front; doubles when full
+ANT_LIFESPAN = None  # Ticks an ant lives, or None for no limit
+ANT_STARVATION = None  # Ticks an ant survives without bringing food home, or None
 
 # Food settings
 FOOD_SIZE = 10
 FOOD_AMOUNT = 10
+FOOD_FIELD_CELL = SENSE_RANGE  # Pixels per side of a food bucket; at least the sensing range
 
 # Nest settings
 NEST_SIZE = 20
+FLOW_CELL = 5  # Pixels per nest flow field cell
 FOOD_TO_SPAWN_ANT = 5  # Food units required to spawn a new ant
 
 # Pheromone settings
 PHEROMONE_STRENGTH = 200  # Increased from 100
 PHEROMONE_DECAY = 0.5     # Reduced from 1
 PHEROMONE_DROP_INTERVAL = 10
+TO_NEST, TO_FOOD = 0, 1  # Pheromone directions
+
+# HUD settings
+HUD_FONT = ("Consolas", 24)
+MAX_DIRTY_RECTS = 512  # Beyond this many changed areas a frame flips the whole screen
+TEXT_CACHE_SIZE = 256  # Rendered text surfaces kept around
 
 class Pheromone:
+    __slots__ = ('x', 'y', 'strength', 'direction')
+
     def __init__(self, x, y, strength, direction):
         self.x = x
         self.y = y
         self.strength = strength
-        self.direction = direction  # "to_nest" or "to_food"
+        self.direction = direction  # TO_NEST or TO_FOOD
 
     def decay(self):
         self.strength -= PHEROMONE_DECAY
         return self.strength > 0
 
     def draw(self, screen):
-        if self.direction == "to_nest":
-            color = (255, 255, 0, int(self.strength / PHEROMONE_STRENGTH * 255))  # Yellow for "to_nest"
+        if self.direction == TO_NEST:
+            color = (255, 255, 0, int(self.strength / PHEROMONE_STRENGTH * 255))  # Yellow for TO_NEST
         else:
-            color = (255, 165, 0, int(self.strength / PHEROMONE_STRENGTH * 255))  # Orange for "to_food"
-        pygame.draw.circle(screen, color, (int(self.x), int(self.y)), 2)
+            color = (255, 165, 0, int(self.strength / PHEROMONE_STRENGTH * 255))  # Orange for TO_FOOD
+        return pygame.draw.circle(screen, color, (int(self.x), int(self.y)), 2)
 
 class Ant:
+    __slots__ = ('x', 'y', 'nest', 'angle', 'has_food', 'pheromone_timer', 'speed', 'slot')
+
     def __init__(self, x, y, nest, speed):
+        self.nest = nest
+        self.slot = None  # Set by the AntPool that owns the ant
+        self.reset(x, y, speed)
+
+    def reset(self, x, y, speed):
+        """Start over as a fresh ant at (x, y); pooled ants are reused this way."""
         self.x = x
         self.y = y
-        self.nest = nest
         self.angle = random.uniform(0, 2 * math.pi)
         self.has_food = False
         self.pheromone_timer = 0
@@ -67,9 +88,7 @@ class Ant:
     def move(self):
         if self.has_food:
             # If the ant has food, move directly toward the nest
-            dx = self.nest.x - self.x
-            dy = self.nest.y - self.y
-            self.angle = math.atan2(dy, dx)
+            self.angle = self.nest.heading(self.x, self.y)
         else:
             # If the ant doesn't have food, wander randomly
             self.angle += random.uniform(-0.5, 0.5)  # Small random turn
@@ -84,20 +103,15 @@ class Ant:
         if self.y < 0 or self.y > HEIGHT:
             self.angle = -self.angle
 
-    def sense_food(self, foods):
+    def sense_food(self, food_field):
         if self.has_food:
             return None
 
-        for food in foods:
-            if food.amount <= 0:  # Ignore food that's already collected
-                continue
-            dx = food.x - self.x
-            dy = food.y - self.y
-            distance = math.hypot(dx, dy)
-            if distance < SENSE_RANGE:
-                self.angle = math.atan2(dy, dx)
-                return food
-        return None
+        # Nearest food in range; collected food is already out of the field
+        food, distance = food_field.lookup(self.x, self.y)
+        if food is not None:
+            self.angle = math.atan2(food.y - self.y, food.x - self.x)
+        return food
 
     def sense_pheromones(self, pheromones, pheromone_influence):
         if self.has_food:
@@ -107,7 +121,7 @@ class Ant:
         max_strength = 0
 
         for pheromone in pheromones:
-            if pheromone.direction != "to_food":  # Only follow "to_food" pheromones
+            if pheromone.direction != TO_FOOD:  # Only follow TO_FOOD pheromones
                 continue
             dx = pheromone.x - self.x
             dy = pheromone.y - self.y
@@ -139,10 +153,12 @@ class Ant:
             self.has_food = False
             self.nest.food_deposited += 1  # Increment food deposit counter
             self.nest.total_food_collected += 1  # Increment total food collected
+            return True
+        return False
 
     def drop_pheromone(self, pheromones):
         if self.has_food and self.pheromone_timer <= 0:
-            pheromones.append(Pheromone(self.x, self.y, PHEROMONE_STRENGTH, "to_nest"))
+            pheromones.append(Pheromone(self.x, self.y, PHEROMONE_STRENGTH, TO_NEST))
             self.pheromone_timer = PHEROMONE_DROP_INTERVAL
         else:
             self.pheromone_timer -= 1
@@ -151,7 +167,85 @@ class Ant:
         color = RED if self.has_food else BLACK
         pygame.draw.circle(screen, color, (int(self.x), int(self.y)), ANT_SIZE)
 
+class AntPool:
+    """The colony's ants, kept in preallocated slots recycled through a free list.
+
+    Iterating yields the live ants in slot order. Capacity doubles when
+    every slot is taken, and a dead ant's slot and Ant object go to the next
+    spawn, so a long-running colony stops allocating once it peaks. Age and
+    hunger (ticks since the ant last brought food home) live in arrays, so
+    the lifespan and starvation rules are one vectorized pass per tick.
+    """
+    def __init__(self, nest, capacity=ANT_POOL_CAPACITY, lifespan=ANT_LIFESPAN, starvation=ANT_STARVATION):
+        self.nest = nest
+        self.lifespan = lifespan
+        self.starvation = starvation
+        self.slots = []
+        self.alive = np.zeros(0, dtype=bool)
+        self.age = np.zeros(0, dtype=np.int64)
+        self.hunger = np.zeros(0, dtype=np.int64)
+        self.free = []  # Stack of open slots
+        self.count = 0
+        self.grow(capacity)
+
+    def grow(self, capacity):
+        old = len(self.slots)
+        for slot in range(old, capacity):
+            ant = Ant(self.nest.x, self.nest.y, self.nest, ANT_SPEED)
+            ant.slot = slot
+            self.slots.append(ant)
+        for name in ('alive', 'age', 'hunger'):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:old] = array
+            setattr(self, name, grown)
+        self.free.extend(range(capacity - 1, old - 1, -1))
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        slots = self.slots
+        return (slots[slot] for slot in np.flatnonzero(self.alive))
+
+    def spawn(self, x, y, speed):
+        if not self.free:
+            self.grow(2 * len(self.slots))
+        slot = self.free.pop()
+        ant = self.slots[slot]
+        ant.reset(x, y, speed)
+        self.alive[slot] = True
+        self.age[slot] = 0
+        self.hunger[slot] = 0
+        self.count += 1
+        return ant
+
+    def feed(self, ant):
+        self.hunger[ant.slot] = 0
+
+    def clear(self):
+        self.alive[:] = False
+        self.free = list(range(len(self.slots) - 1, -1, -1))
+        self.count = 0
+
+    def tick(self):
+        """Age every ant by one tick and free the slots of those that die; returns the deaths."""
+        self.age += 1
+        self.hunger += 1
+        dead = np.zeros_like(self.alive)
+        if self.lifespan is not None:
+            dead |= self.age >= self.lifespan
+        if self.starvation is not None:
+            dead |= self.hunger >= self.starvation
+        slots = np.flatnonzero(dead & self.alive)
+        self.alive[slots] = False
+        self.free.extend(slots[::-1].tolist())
+        self.count -= len(slots)
+        return len(slots)
+
 class Food:
+    __slots__ = ('x', 'y', 'amount')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -159,27 +253,156 @@ class Food:
 
     def draw(self, screen):
         if self.amount > 0:  # Only draw food if it hasn't been fully collected
-            pygame.draw.circle(screen, GREEN, (int(self.x), int(self.y)), self.amount)
+            return pygame.draw.circle(screen, GREEN, (int(self.x), int(self.y)), self.amount)
+        return None
+
+class FoodField:
+    """Foods bucketed by FOOD_FIELD_CELL-sized squares of the map.
+
+    A square is at least as wide as the sensing range, so only the foods in
+    the 3x3 squares around an ant can be in range. Each of those is measured
+    from the ant itself, which gives the same food as scanning all of them.
+    """
+    def __init__(self, foods=()):
+        self.reset(foods)
+
+    def reset(self, foods):
+        self.buckets = {}
+        for food in foods:
+            self.add(food)
+
+    def bucket(self, x, y):
+        return int(x // FOOD_FIELD_CELL), int(y // FOOD_FIELD_CELL)
+
+    def add(self, food):
+        self.buckets.setdefault(self.bucket(food.x, food.y), []).append(food)
+
+    def remove(self, food):
+        foods = self.buckets.get(self.bucket(food.x, food.y), [])
+        if food in foods:
+            foods.remove(food)
+
+    def lookup(self, x, y):
+        """Nearest food to (x, y) and its distance, or (None, SENSE_RANGE) if none is in range."""
+        closest_food, closest_distance = None, SENSE_RANGE
+        bx, by = self.bucket(x, y)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for food in self.buckets.get((bx + dx, by + dy), ()):
+                    distance = math.hypot(food.x - x, food.y - y)
+                    if distance < closest_distance:
+                        closest_food, closest_distance = food, distance
+        return closest_food, closest_distance
+
+def nest_flow_field(x, y, cell=FLOW_CELL):
+    """Angle toward (x, y) from the center of every cell of the map, indexed [cx][cy]."""
+    cx = (np.arange(WIDTH // cell + 1) + 0.5) * cell
+    cy = (np.arange(HEIGHT // cell + 1) + 0.5) * cell
+    return np.arctan2(y - cy[None, :], x - cx[:, None]).tolist()
 
 class Nest:
+    __slots__ = ('x', 'y', 'food_deposited', 'total_food_collected', 'total_ants_spawned', 'flow')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
         self.food_deposited = 0  # Counter for food deposits
         self.total_food_collected = 0  # Counter for total food collected
         self.total_ants_spawned = 0  # Counter for total ants spawned
+        self.flow = nest_flow_field(x, y)  # Heading to the nest per FLOW_CELL cell
+
+    def heading(self, x, y):
+        """Angle toward the nest from (x, y), looked up in the flow field."""
+        cx = min(max(int(x) // FLOW_CELL, 0), len(self.flow) - 1)
+        cy = min(max(int(y) // FLOW_CELL, 0), len(self.flow[0]) - 1)
+        return self.flow[cx][cy]
 
     def spawn_ant(self, ants, speed):
         if self.food_deposited >= FOOD_TO_SPAWN_ANT:
-            ants.append(Ant(self.x, self.y, self, speed))  # Spawn a new ant at the nest
+            ants.spawn(self.x, self.y, speed)  # Spawn a new ant at the nest
             self.food_deposited = 0  # Reset the counter
             self.total_ants_spawned += 1  # Increment total ants spawned
 
     def draw(self, screen):
-        pygame.draw.circle(screen, BLUE, (int(self.x), int(self.y)), NEST_SIZE)
+        return pygame.draw.circle(screen, BLUE, (int(self.x), int(self.y)), NEST_SIZE)
+
+def disc_offsets(radius):
+    """Pixel offsets (dx, dy) covering a filled disc of the given radius."""
+    d = np.arange(-radius, radius + 1)
+    dx, dy = np.meshgrid(d, d, indexing='ij')
+    inside = dx * dx + dy * dy <= radius * radius
+    return dx[inside], dy[inside]
+
+ANT_STAMP = disc_offsets(ANT_SIZE)
+
+def ant_arrays(ants):
+    """Ant positions, headings and carried food as numpy arrays, for batch kernels."""
+    n = len(ants)
+    return {
+        'x': np.fromiter((ant.x for ant in ants), dtype=float, count=n),
+        'y': np.fromiter((ant.y for ant in ants), dtype=float, count=n),
+        'angle': np.fromiter((ant.angle for ant in ants), dtype=float, count=n),
+        'has_food': np.fromiter((ant.has_food for ant in ants), dtype=bool, count=n),
+    }
+
+def pheromone_arrays(pheromones):
+    """Pheromone positions, strengths and TO_NEST/TO_FOOD directions as numpy arrays."""
+    n = len(pheromones)
+    return {
+        'x': np.fromiter((p.x for p in pheromones), dtype=float, count=n),
+        'y': np.fromiter((p.y for p in pheromones), dtype=float, count=n),
+        'strength': np.fromiter((p.strength for p in pheromones), dtype=float, count=n),
+        'direction': np.fromiter((p.direction for p in pheromones), dtype=np.int8, count=n),
+    }
+
+def draw_ants(screen, ants, stamp=ANT_STAMP):
+    """Draw all ants with one pixel-array write instead of a circle call per ant.
+
+    Returns the (x, y, w, h) area each ant covers, for dirty-rect updates.
+    """
+    if not ants:
+        return []
+    arrays = ant_arrays(ants)
+    xs, ys, carrying = arrays['x'], arrays['y'], arrays['has_food']
+    # Carrying ants go last so they stay visible in crowds
+    order = np.argsort(carrying, kind='stable')
+    dx, dy = stamp
+    px = (xs[order].astype(int)[:, None] + dx).ravel()
+    py = (ys[order].astype(int)[:, None] + dy).ravel()
+    palette = np.array([screen.map_rgb(BLACK), screen.map_rgb(RED)])
+    values = np.repeat(palette[carrying[order].astype(int)], len(dx))
+    inside = (px >= 0) & (px < WIDTH) & (py >= 0) & (py < HEIGHT)
+    pixels = pygame.surfarray.pixels2d(screen)
+    pixels[px[inside], py[inside]] = values[inside]
+    del pixels  # Unlock the screen before the next blit
+    size = 2 * ANT_SIZE + 1
+    return [(x, y, size, size) for x, y in zip((xs.astype(int) - ANT_SIZE).tolist(),
+                                               (ys.astype(int) - ANT_SIZE).tolist())]
+
+_fonts = {}
+_text_surfaces = {}
+
+def get_font(name, size):
+    """Shared font registry: each (name, size) is looked up once."""
+    font = _fonts.get((name, size))
+    if font is None:
+        font = _fonts[(name, size)] = pygame.font.SysFont(name, size)
+    return font
+
+def render_text(text, color, font=HUD_FONT):
+    """Antialiased text surface, cached by string and style."""
+    key = (text, color, font)
+    surface = _text_surfaces.get(key)
+    if surface is None:
+        if len(_text_surfaces) >= TEXT_CACHE_SIZE:
+            # Evict the oldest entry; dicts keep insertion order
+            del _text_surfaces[next(iter(_text_surfaces))]
+        surface = _text_surfaces[key] = get_font(*font).render(text, True, color)
+    return surface
+
+_counter_panel = {'size': None, 'surface': None}
 
 def draw_counters(screen, ants, total_food_collected, total_ants_spawned, time_elapsed, ant_speed, pheromone_influence):
-    font = pygame.font.SysFont("Consolas", 24)  # Cooler font
     y_offset = 10  # Vertical spacing between counters
     padding = 10  # Padding around the text
     max_width = 0  # Track the maximum width of the text
@@ -195,29 +418,36 @@ def draw_counters(screen, ants, total_food_collected, total_ants_spawned, time_e
         f"Pheromone Influence: {pheromone_influence:.2f}"
     ]
 
+    # Text surfaces only get rasterized when a counter string changes
+    texts = [render_text(counter, WHITE) for counter in counters]
+
     # Calculate the maximum width of the texts
-    for counter in counters:
-        text_width, _ = font.size(counter)
+    for text in texts:
+        text_width = text.get_width()
         if text_width > max_width:
             max_width = text_width
 
-    # Draw the semi-transparent background rectangle
+    # Draw the semi-transparent background rectangle, rebuilt only when it resizes
     rect_height = len(counters) * 30 + padding * 2
     rect_width = max_width + padding * 2
-    background_rect = pygame.Surface((rect_width, rect_height), pygame.SRCALPHA)
-    background_rect.fill(COUNTER_BG_COLOR)
-    screen.blit(background_rect, (10, 10))
+    if _counter_panel['size'] != (rect_width, rect_height):
+        background_rect = pygame.Surface((rect_width, rect_height), pygame.SRCALPHA)
+        background_rect.fill(COUNTER_BG_COLOR)
+        _counter_panel['size'] = (rect_width, rect_height)
+        _counter_panel['surface'] = background_rect
+    screen.blit(_counter_panel['surface'], (10, 10))
 
     # Draw the border around the rectangle
     pygame.draw.rect(screen, COUNTER_BORDER_COLOR, (10, 10, rect_width, rect_height), 2)
 
     # Draw the counters
-    for counter in counters:
-        text = font.render(counter, True, WHITE)
+    for text in texts:
         screen.blit(text, (10 + padding, y_offset))
         y_offset += 30
 
-def draw_buttons(screen, font, input_text, paused, pheromone_influence):
+    return pygame.Rect(10, 10, rect_width, rect_height)
+
+def draw_buttons(screen, input_text, paused, pheromone_influence):
     # Button dimensions and positions
     button_width = 150
     button_height = 40
@@ -227,67 +457,72 @@ def draw_buttons(screen, font, input_text, paused, pheromone_influence):
     # Reset button
     reset_button = pygame.Rect(x_offset, y_offset, button_width, button_height)
     pygame.draw.rect(screen, BUTTON_BG_COLOR, reset_button)
-    reset_text = font.render("Reset (R)", True, BUTTON_TEXT_COLOR)
+    reset_text = render_text("Reset (R)", BUTTON_TEXT_COLOR)
     screen.blit(reset_text, (x_offset + 10, y_offset + 10))
 
     # Play/Pause button
     y_offset += button_height + 10
     play_pause_button = pygame.Rect(x_offset, y_offset, button_width, button_height)
     pygame.draw.rect(screen, BUTTON_BG_COLOR, play_pause_button)
-    play_pause_text = font.render("Pause (Space)" if not paused else "Play (Space)", True, BUTTON_TEXT_COLOR)
+    play_pause_text = render_text("Pause (Space)" if not paused else "Play (Space)", BUTTON_TEXT_COLOR)
     screen.blit(play_pause_text, (x_offset + 10, y_offset + 10))
 
     # Increase speed button
     y_offset += button_height + 10
     increase_speed_button = pygame.Rect(x_offset, y_offset, button_width, button_height)
     pygame.draw.rect(screen, BUTTON_BG_COLOR, increase_speed_button)
-    increase_text = font.render("Speed+ (+)", True, BUTTON_TEXT_COLOR)
+    increase_text = render_text("Speed+ (+)", BUTTON_TEXT_COLOR)
     screen.blit(increase_text, (x_offset + 10, y_offset + 10))
 
     # Decrease speed button
     y_offset += button_height + 10
     decrease_speed_button = pygame.Rect(x_offset, y_offset, button_width, button_height)
     pygame.draw.rect(screen, BUTTON_BG_COLOR, decrease_speed_button)
-    decrease_text = font.render("Speed- (-)", True, BUTTON_TEXT_COLOR)
+    decrease_text = render_text("Speed- (-)", BUTTON_TEXT_COLOR)
     screen.blit(decrease_text, (x_offset + 10, y_offset + 10))
 
     # Set ants button
     y_offset += button_height + 10
     set_ants_button = pygame.Rect(x_offset, y_offset, button_width, button_height)
     pygame.draw.rect(screen, BUTTON_BG_COLOR, set_ants_button)
-    set_ants_text = font.render("Set Ants", True, BUTTON_TEXT_COLOR)
+    set_ants_text = render_text("Set Ants", BUTTON_TEXT_COLOR)
     screen.blit(set_ants_text, (x_offset + 10, y_offset + 10))
 
     # Input box for number of ants
     y_offset += button_height + 10
     input_box = pygame.Rect(x_offset, y_offset, button_width, button_height)
     pygame.draw.rect(screen, BUTTON_BG_COLOR, input_box)
-    input_text_surface = font.render(input_text, True, BUTTON_TEXT_COLOR)
+    input_text_surface = render_text(input_text, BUTTON_TEXT_COLOR)
     screen.blit(input_text_surface, (x_offset + 10, y_offset + 10))
 
     # Increase pheromone influence button
     y_offset += button_height + 10
     increase_pheromone_button = pygame.Rect(x_offset, y_offset, button_width, button_height)
     pygame.draw.rect(screen, BUTTON_BG_COLOR, increase_pheromone_button)
-    increase_pheromone_text = font.render("Pheromone+", True, BUTTON_TEXT_COLOR)
+    increase_pheromone_text = render_text("Pheromone+", BUTTON_TEXT_COLOR)
     screen.blit(increase_pheromone_text, (x_offset + 10, y_offset + 10))
 
     # Decrease pheromone influence button
     y_offset += button_height + 10
     decrease_pheromone_button = pygame.Rect(x_offset, y_offset, button_width, button_height)
     pygame.draw.rect(screen, BUTTON_BG_COLOR, decrease_pheromone_button)
-    decrease_pheromone_text = font.render("Pheromone-", True, BUTTON_TEXT_COLOR)
+    decrease_pheromone_text = render_text("Pheromone-", BUTTON_TEXT_COLOR)
     screen.blit(decrease_pheromone_text, (x_offset + 10, y_offset + 10))
 
-def reset_simulation(nest, ants, foods, pheromones, initial_ants, ant_speed):
+    # The button column, widened to the screen edge for text that overhangs a box
+    return pygame.Rect(x_offset, 20, WIDTH - x_offset, y_offset + button_height - 20)
+
+def reset_simulation(nest, ants, foods, food_field, pheromones, initial_ants, ant_speed):
     nest.food_deposited = 0
     nest.total_food_collected = 0
     nest.total_ants_spawned = 0
     ants.clear()
     foods.clear()
     pheromones.clear()
-    ants.extend([Ant(nest.x, nest.y, nest, ant_speed) for _ in range(initial_ants)])
+    for _ in range(initial_ants):
+        ants.spawn(nest.x, nest.y, ant_speed)
     foods.extend([Food(random.randint(0, WIDTH), random.randint(0, HEIGHT)) for _ in range(FOOD_AMOUNT)])
+    food_field.reset(foods)
 
 def main():
     pygame.init()
@@ -298,8 +533,11 @@ def main():
     nest = Nest(WIDTH // 2, HEIGHT // 2)
     initial_ants = 20  # Default number of ants at start
     ant_speed = ANT_SPEED  # Default ant speed
-    ants = [Ant(nest.x, nest.y, nest, ant_speed) for _ in range(initial_ants)]  # All ants start at the nest
+    ants = AntPool(nest)
+    for _ in range(initial_ants):
+        ants.spawn(nest.x, nest.y, ant_speed)  # All ants start at the nest
     foods = [Food(random.randint(0, WIDTH), random.randint(0, HEIGHT)) for _ in range(FOOD_AMOUNT)]
+    food_field = FoodField(foods)
     pheromones = deque()
 
     running = True
@@ -308,6 +546,9 @@ def main():
     input_text = ""  # Text input for number of ants
     input_active = False  # Whether the input box is active
     pheromone_influence = 0.8  # Default pheromone influence strength
+    # Areas drawn last frame; only they and this frame's areas can differ
+    # from plain background, so only they are pushed to the display
+    last_rects = None
 
     while running:
         clock.tick(FPS)
@@ -318,7 +559,7 @@ def main():
                 running = False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:  # Reset simulation
-                    reset_simulation(nest, ants, foods, pheromones, initial_ants, ant_speed)
+                    reset_simulation(nest, ants, foods, food_field, pheromones, initial_ants, ant_speed)
                 elif event.key == pygame.K_SPACE:  # Pause/Play simulation
                     paused = not paused
                 elif event.key == pygame.K_PLUS or event.key == pygame.K_EQUALS:  # Increase ant speed
@@ -332,7 +573,7 @@ def main():
                 elif event.key == pygame.K_RETURN and input_active:  # Set initial ants from input
                     try:
                         initial_ants = int(input_text)
-                        reset_simulation(nest, ants, foods, pheromones, initial_ants, ant_speed)
+                        reset_simulation(nest, ants, foods, food_field, pheromones, initial_ants, ant_speed)
                         input_text = ""  # Clear input box
                     except ValueError:
                         pass  # Ignore invalid input
@@ -345,7 +586,7 @@ def main():
                 mouse_pos = pygame.mouse.get_pos()
                 if WIDTH - 170 <= mouse_pos[0] <= WIDTH - 20:
                     if 20 <= mouse_pos[1] <= 60:  # Reset button
-                        reset_simulation(nest, ants, foods, pheromones, initial_ants, ant_speed)
+                        reset_simulation(nest, ants, foods, food_field, pheromones, initial_ants, ant_speed)
                     elif 80 <= mouse_pos[1] <= 120:  # Play/Pause button
                         paused = not paused
                     elif 140 <= mouse_pos[1] <= 180:  # Increase speed button
@@ -375,42 +616,50 @@ def main():
             for food in list(foods):
                 if food.amount <= 0:
                     foods.remove(food)
-                    foods.append(Food(random.randint(0, WIDTH), random.randint(0, HEIGHT)))  # Spawn new food
+                    food_field.remove(food)
+                    food = Food(random.randint(0, WIDTH), random.randint(0, HEIGHT))  # Spawn new food
+                    foods.append(food)
+                    food_field.add(food)
 
             for ant in ants:
                 ant.move()
-                food = ant.sense_food(foods)
+                food = ant.sense_food(food_field)
                 if food and food.amount > 0:
                     ant.collect_food(food)
-                if ant.has_food:
-                    ant.deposit_food()
+                    if food.amount <= 0:
+                        food_field.remove(food)
+                if ant.has_food and ant.deposit_food():
+                    ants.feed(ant)
                 ant.sense_pheromones(pheromones, pheromone_influence)
                 ant.drop_pheromone(pheromones)
 
-            # Spawn new ants if enough food has been deposited
+            # Spawn new ants if enough food has been deposited, retire old or starved ones
             nest.spawn_ant(ants, ant_speed)
+            ants.tick()
 
-        for food in foods:
-            food.draw(screen)
+        rects = [food.draw(screen) for food in foods]
 
-        for pheromone in pheromones:
-            pheromone.draw(screen)
+        rects.extend(pheromone.draw(screen) for pheromone in pheromones)
 
-        for ant in ants:
-            ant.draw(screen)
+        rects.extend(draw_ants(screen, ants))
 
-        nest.draw(screen)
+        rects.append(nest.draw(screen))
 
         # Draw counters
         if not paused:
             time_elapsed += 1 / FPS  # Increment time elapsed
-        draw_counters(screen, ants, nest.total_food_collected, nest.total_ants_spawned, int(time_elapsed), ant_speed, pheromone_influence)
+        rects.append(draw_counters(screen, ants, nest.total_food_collected, nest.total_ants_spawned, int(time_elapsed), ant_speed, pheromone_influence))
 
         # Draw buttons
-        font = pygame.font.SysFont("Consolas", 24)
-        draw_buttons(screen, font, input_text, paused, pheromone_influence)
+        rects.append(draw_buttons(screen, input_text, paused, pheromone_influence))
 
-        pygame.display.flip()
+        # Push what was drawn now and what was drawn last frame (now erased)
+        rects = [rect for rect in rects if rect is not None]
+        if last_rects is None or len(rects) + len(last_rects) > MAX_DIRTY_RECTS:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects + last_rects)
+        last_rects = rects
 
     pygame.quit()
 
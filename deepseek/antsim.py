@@ -24,6 +24,8 @@ FOOD_AMOUNT = 10
 NEST_SIZE = 20
 
 class Ant:
+    __slots__ = ('x', 'y', 'nest', 'angle', 'has_food')
+
     def __init__(self, x, y, nest):
         self.x = x
         self.y = y
@@ -85,6 +87,8 @@ class Ant:
         pygame.draw.circle(screen, color, (int(self.x), int(self.y)), ANT_SIZE)
 
 class Food:
+    __slots__ = ('x', 'y', 'amount')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -95,6 +99,8 @@ class Food:
             pygame.draw.circle(screen, GREEN, (int(self.x), int(self.y)), self.amount)
 
 class Nest:
+    __slots__ = ('x', 'y')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -19,22 +19,108 @@ ANT_COUNT = 100
 ANT_SPEED = 2
 SENSE_ANGLE = 30
 SENSE_DISTANCE = 20
+SENSOR_RADIUS = 0  # Half-width in pixels of each sensor's window; 0 reads a single pixel
+SENSOR_SHAPE = "square"  # "square" around the sample point, or "sector" out from the ant
+SECTOR_BOXES = 3  # Squares approximating a sector sensor
 PHEROMONE_DECAY = 0.99
 PHEROMONE_STRENGTH = 50
 FOOD_AMOUNT = 500
 FOOD_RADIUS = 10
 
+PHEROMONE_CAP = 500
+FLOW_CELL = 5  # Pixels per nest flow field cell
+
+def nest_flow_field(target, cell=FLOW_CELL):
+    """Velocity toward target from the center of every cell, indexed [cx][cy]."""
+    cx = (np.arange(SCREEN_WIDTH // cell + 1) + 0.5) * cell
+    cy = (np.arange(SCREEN_HEIGHT // cell + 1) + 0.5) * cell
+    dx = target.x - cx[:, None]
+    dy = target.y - cy[None, :]
+    norm = np.maximum(np.hypot(dx, dy), 1e-9) / ANT_SPEED
+    return np.stack([dx / norm, dy / norm], axis=-1).tolist()
+
+NEST_FLOW = nest_flow_field(NEST_POS)
+
 class PheromoneGrid:
     def __init__(self):
         self.grid = np.zeros((SCREEN_WIDTH, SCREEN_HEIGHT), dtype=np.float32)
+        self.pending = []
+        # Summed-area table for area sensors: table[x, y] is grid[:x, :y].sum(),
+        # rebuilt on the first area query after the grid changes
+        self.table = np.zeros((SCREEN_WIDTH + 1, SCREEN_HEIGHT + 1))
+        self.table_stale = True
     
     def decay(self):
         self.grid *= PHEROMONE_DECAY
+        self.table_stale = True
     
     def add_pheromone(self, x, y, amount):
         if 0 <= x < SCREEN_WIDTH and 0 <= y < SCREEN_HEIGHT:
             self.grid[int(x)][int(y)] += amount
-            self.grid[int(x)][int(y)] = min(self.grid[int(x)][int(y)], 500)
+            self.grid[int(x)][int(y)] = min(self.grid[int(x)][int(y)], PHEROMONE_CAP)
+            self.table_stale = True
+    
+    def queue_pheromone(self, x, y, amount):
+        # Deferred add_pheromone, applied by flush() together with the rest of the tick
+        if 0 <= x < SCREEN_WIDTH and 0 <= y < SCREEN_HEIGHT:
+            self.pending.append((int(x), int(y), amount))
+    
+    def add_pheromones(self, xs, ys, amounts):
+        # Batched add_pheromone: ants sharing a cell are summed before capping
+        xs = np.asarray(xs, dtype=np.intp)
+        if len(xs) == 0:
+            return
+        flat = xs * SCREEN_HEIGHT + np.asarray(ys, dtype=np.intp)
+        cells, slot = np.unique(flat, return_inverse=True)
+        amounts = np.broadcast_to(np.asarray(amounts, dtype=np.float32), flat.shape)
+        totals = np.bincount(slot, weights=amounts, minlength=len(cells))
+        cx, cy = np.divmod(cells, SCREEN_HEIGHT)
+        self.grid[cx, cy] = np.minimum(self.grid[cx, cy] + totals, PHEROMONE_CAP)
+        self.table_stale = True
+    
+    def flush(self):
+        if self.pending:
+            self.add_pheromones(*zip(*self.pending))
+            self.pending.clear()
+    
+    def box(self, x, y, radius):
+        # Pheromone total and pixel count of the square of half-width radius
+        # around (x, y), clipped to the screen: four table reads at any size
+        if self.table_stale:
+            inner = self.table[1:, 1:]
+            np.cumsum(self.grid, axis=0, dtype=np.float64, out=inner)
+            np.cumsum(inner, axis=1, out=inner)
+            self.table_stale = False
+        x, y = int(x), int(y)
+        x0, x1 = max(x - radius, 0), min(x + radius + 1, SCREEN_WIDTH)
+        y0, y1 = max(y - radius, 0), min(y + radius + 1, SCREEN_HEIGHT)
+        if x0 >= x1 or y0 >= y1:
+            return 0.0, 0
+        t = self.table
+        return t[x1, y1] - t[x0, y1] - t[x1, y0] + t[x0, y0], (x1 - x0) * (y1 - y0)
+    
+    def sense(self, pos, direction, radius=SENSOR_RADIUS, shape=SENSOR_SHAPE):
+        """Mean pheromone seen by a sensor pointing along the unit vector direction from pos."""
+        if shape == "sector":
+            # The wedge out to SENSE_DISTANCE as squares that widen with distance
+            total = area = 0
+            for i in range(1, SECTOR_BOXES + 1):
+                center = pos + direction * (SENSE_DISTANCE * i / SECTOR_BOXES)
+                box_total, box_area = self.box(center.x, center.y, radius * i // SECTOR_BOXES)
+                total += box_total
+                area += box_area
+            return total / area if area else 0
+        if shape != "square":
+            raise ValueError(f"unknown sensor shape {shape!r}")
+        sample_pos = pos + direction * SENSE_DISTANCE
+        x = int(sample_pos.x)
+        y = int(sample_pos.y)
+        if not (0 <= x < SCREEN_WIDTH and 0 <= y < SCREEN_HEIGHT):
+            return 0
+        if radius == 0:
+            return self.grid[x][y]
+        box_total, box_area = self.box(x, y, radius)
+        return box_total / box_area
 
 class FoodSource:
     def __init__(self, x, y, amount):
@@ -68,14 +154,10 @@ class Ant:
         
         for angle in [-SENSE_ANGLE, 0, SENSE_ANGLE]:
             dir = self.vel.rotate(angle).normalize()
-            sample_pos = self.pos + dir * SENSE_DISTANCE
-            x = int(sample_pos.x)
-            y = int(sample_pos.y)
-            if 0 <= x < SCREEN_WIDTH and 0 <= y < SCREEN_HEIGHT:
-                strength = pheromone_grid.grid[x][y]
-                if strength > best_strength:
-                    best_strength = strength
-                    best_dir = dir
+            strength = pheromone_grid.sense(self.pos, dir)
+            if strength > best_strength:
+                best_strength = strength
+                best_dir = dir
         
         if best_dir is not None:
             self.vel = best_dir * ANT_SPEED
@@ -83,9 +165,9 @@ class Ant:
             self.vel = self.vel.rotate(random.uniform(-30, 30)).normalize() * ANT_SPEED
     
     def return_to_nest(self, pheromone_grid):
-        direction = (NEST_POS - self.pos).normalize()
-        self.vel = direction * ANT_SPEED
-        pheromone_grid.add_pheromone(self.pos.x, self.pos.y, PHEROMONE_STRENGTH)
+        # One lookup in the precomputed flow field instead of a normalize per ant
+        self.vel = pygame.Vector2(NEST_FLOW[int(self.pos.x) // FLOW_CELL][int(self.pos.y) // FLOW_CELL])
+        pheromone_grid.queue_pheromone(self.pos.x, self.pos.y, PHEROMONE_STRENGTH)
     
     def check_food(self, foods):
         for food in foods:
@@ -100,12 +182,41 @@ class Ant:
             self.carried_food = 0
             self.state = "exploring"
 
+def disc_offsets(radius):
+    """Pixel offsets (dx, dy) covering a filled disc of the given radius."""
+    d = np.arange(-radius, radius + 1)
+    dx, dy = np.meshgrid(d, d, indexing='ij')
+    inside = dx * dx + dy * dy <= radius * radius
+    return dx[inside], dy[inside]
+
+ANT_STAMP = disc_offsets(2)
+
+def draw_ants(screen, ants, stamp=ANT_STAMP):
+    """Draw all ants with one pixel-array write, colored by carry state."""
+    if not ants:
+        return
+    xs = np.fromiter((ant.pos.x for ant in ants), dtype=float, count=len(ants))
+    ys = np.fromiter((ant.pos.y for ant in ants), dtype=float, count=len(ants))
+    carrying = np.fromiter((ant.carried_food > 0 for ant in ants), dtype=bool, count=len(ants))
+    order = np.argsort(carrying, kind='stable')
+    dx, dy = stamp
+    px = (xs[order].astype(int)[:, None] + dx).ravel()
+    py = (ys[order].astype(int)[:, None] + dy).ravel()
+    palette = np.array([screen.map_rgb(ANT_COLOR), screen.map_rgb(FOOD_COLOR)])
+    values = np.repeat(palette[carrying[order].astype(int)], len(dx))
+    inside = (px >= 0) & (px < SCREEN_WIDTH) & (py >= 0) & (py < SCREEN_HEIGHT)
+    pixels = pygame.surfarray.pixels2d(screen)
+    pixels[px[inside], py[inside]] = values[inside]
+    del pixels  # Unlock the screen before the next blit
+
 def main():
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     clock = pygame.time.Clock()
     
     pheromone_grid = PheromoneGrid()
+    pheromone_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), SRCALPHA)
+    pheromone_surface.fill((*PHEROMONE_COLOR, 0))
     ants = [Ant() for _ in range(ANT_COUNT)]
     foods = [FoodSource(SCREEN_WIDTH//4, SCREEN_HEIGHT//4, FOOD_AMOUNT),
              FoodSource(3*SCREEN_WIDTH//4, 3*SCREEN_HEIGHT//4, FOOD_AMOUNT)]
@@ -120,17 +231,14 @@ def main():
         
         for ant in ants:
             ant.update(pheromone_grid, foods)
+        pheromone_grid.flush()
         
         screen.fill(BACKGROUND_COLOR)
         
-        # Draw pheromones
-        pheromone_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), SRCALPHA)
-        for x in range(SCREEN_WIDTH):
-            for y in range(SCREEN_HEIGHT):
-                strength = pheromone_grid.grid[x][y]
-                if strength > 0:
-                    alpha = min(int(strength * 2), 100)
-                    pheromone_surface.set_at((x, y), (*PHEROMONE_COLOR, alpha))
+        # Draw pheromones: one alpha-channel upload instead of a set_at per pixel
+        alpha = pygame.surfarray.pixels_alpha(pheromone_surface)
+        np.minimum(pheromone_grid.grid * 2, 100, out=alpha, casting='unsafe')
+        del alpha  # Release the surface lock before blitting
         screen.blit(pheromone_surface, (0, 0))
         
         # Draw nest
@@ -142,8 +250,7 @@ def main():
                 pygame.draw.circle(screen, FOOD_COLOR, food.pos, FOOD_RADIUS)
         
         # Draw ants
-        for ant in ants:
-            pygame.draw.circle(screen, ANT_COLOR, (int(ant.pos.x), int(ant.pos.y)), 2)
+        draw_ants(screen, ants)
         
         pygame.display.flip()
         clock.tick(60)
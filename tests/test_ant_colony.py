@@ -0,0 +1,51 @@
+import importlib.util
+import os
+import random
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_script(path, name):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+ac = load_script('ant-colony.py', 'ant_colony')
+
+
+def test_memmap_storage_matches_ram(tmp_path):
+    results = []
+    for storage_dir in (None, str(tmp_path)):
+        random.seed(0)
+        np.random.seed(0)
+        colony = ac.AntColony(num_ants=200, world_size=(300, 300), storage_dir=storage_dir)
+        for _ in range(150):
+            colony.step()
+        results.append((np.array(colony.food_pheromone), np.array(colony.home_pheromone)))
+    assert np.array_equal(results[0][0], results[1][0])
+    assert np.array_equal(results[0][1], results[1][1])
+
+
+def test_flow_field_distances():
+    obstacles = ac.ObstacleMap(5, 3)
+    obstacles.add_rect(2, 0, 3, 2)
+    field = ac.FlowField((0, 0), obstacles)
+    # Around the wall through (2, 2), without cutting either of its corners
+    assert np.isclose(field.distance[4, 0], 4 + 2 * np.sqrt(2))
+    assert np.isinf(field.distance[2, 0])
+    assert field.direction[0, 0] == ac.NO_FLOW
+
+
+def test_flow_field_opening_matches_recompute():
+    obstacles = ac.ObstacleMap.maze(96, 64, corridor=8, seed=1)
+    field = ac.FlowField((3, 3), obstacles)
+    obstacles.clear_rect(20, 10, 40, 30)
+    obstacles.clear_circle(70, 40, 6)
+    field.sync()
+    fresh = ac.FlowField((3, 3), obstacles)
+    assert np.array_equal(field.distance, fresh.distance)
+    assert np.array_equal(field.direction, fresh.direction)